@@ -0,0 +1,142 @@
+"""
+This module provides asyncio counterparts of the data_fetcher functions.
+
+Blocking provider calls run in worker threads, so awaiting them does not
+stall the event loop. Requests fan out under a semaphore and share the
+same on-disk price cache, fundamentals cache and request coalescing as
+the synchronous API.
+
+On timeout or cancellation, pending requests are cancelled; requests
+already running in a worker thread finish in the background and their
+results are discarded (completed price downloads still land in the cache).
+"""
+
+import asyncio
+from typing import Awaitable, List, Optional
+
+import pandas as pd
+
+from data_fetcher import (
+    build_fundamentals_frame,
+    fetch_fundamental_info,
+    fetch_price_data,
+    lookup_cached_fundamentals,
+    store_fundamentals,
+)
+from fundamentals_cache import FundamentalsCache
+from providers import DataProvider, YFinanceProvider
+from throttle import TokenBucket
+
+
+async def fetch_price_data_async(
+    tickers: List[str],
+    start: str,
+    end: str,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+    provider: Optional[DataProvider] = None,
+    chunk_size: int = 200,
+    max_concurrency: int = 4,
+    dtype: str = "float64",
+    cache_format: str = "feather",
+    timeout: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Async version of `data_fetcher.fetch_price_data`.
+
+    The universe is split into chunks of `chunk_size` tickers, and up to
+    `max_concurrency` chunks are fetched at once.
+
+    Args:
+        tickers (List[str]): List of stock tickers.
+        start (str): Start date in 'YYYY-MM-DD'.
+        end (str): End date in 'YYYY-MM-DD'.
+        cache_dir (str): Optional directory for the persistent price cache.
+        refresh (bool): Incrementally append new bars instead of filling coverage gaps.
+        provider (DataProvider): Data source, defaults to yfinance.
+        chunk_size (int): Maximum number of tickers per request.
+        max_concurrency (int): Maximum number of chunks in flight.
+        dtype (str): Price dtype, 'float64' or 'float32' for compact mode.
+        cache_format (str): File format of new cache segments, 'feather' or 'parquet'.
+        timeout (float): Optional overall timeout in seconds.
+
+    Returns:
+        pd.DataFrame: DataFrame with date as index and tickers as columns.
+
+    Raises:
+        asyncio.TimeoutError: If the timeout expires first.
+    """
+    provider = provider or YFinanceProvider()
+    tickers = list(dict.fromkeys(tickers))
+    chunk_size = max(1, chunk_size)
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch_chunk(chunk: List[str]) -> pd.DataFrame:
+        async with semaphore:
+            return await asyncio.to_thread(
+                fetch_price_data, chunk, start, end,
+                cache_dir=cache_dir, refresh=refresh, provider=provider,
+                chunk_size=len(chunk), max_workers=1, dtype=dtype,
+                cache_format=cache_format
+            )
+
+    frames = await _gather(
+        [fetch_chunk(chunk) for chunk in chunks],
+        timeout
+    )
+    if not frames:
+        return pd.DataFrame(columns=tickers, dtype=dtype)
+
+    df = pd.concat(frames, axis=1).reindex(columns=tickers)
+    df.index.name = "Date"
+    return df.sort_index().dropna(how="all")
+
+
+async def fetch_fundamentals_async(
+    tickers: List[str],
+    max_concurrency: int = 8,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    cache: Optional[FundamentalsCache] = None,
+    provider: Optional[DataProvider] = None,
+    timeout: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Async version of `data_fetcher.fetch_fundamentals`.
+
+    Args:
+        tickers (List[str]): List of stock tickers.
+        max_concurrency (int): Maximum number of concurrent requests.
+        requests_per_second (float): Optional rate limit shared by all requests.
+        max_retries (int): Retries per ticker after the first attempt.
+        cache (FundamentalsCache): Optional cache; only expired or missing tickers are fetched.
+        provider (DataProvider): Data source, defaults to yfinance.
+        timeout (float): Optional overall timeout in seconds.
+
+    Returns:
+        pd.DataFrame: DataFrame with fundamentals indexed by ticker.
+
+    Raises:
+        asyncio.TimeoutError: If the timeout expires first.
+    """
+    provider = provider or YFinanceProvider()
+    limiter = TokenBucket(requests_per_second) if requests_per_second else None
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    cached, to_fetch = lookup_cached_fundamentals(tickers, cache)
+
+    async def fetch_one(ticker: str) -> Optional[dict]:
+        async with semaphore:
+            return await asyncio.to_thread(fetch_fundamental_info, provider, ticker, limiter, max_retries)
+
+    infos = await _gather([fetch_one(ticker) for ticker in to_fetch], timeout)
+    fetched = dict(zip(to_fetch, infos))
+
+    await asyncio.to_thread(store_fundamentals, fetched, cache)
+    return build_fundamentals_frame(tickers, cached, fetched)
+
+
+async def _gather(aws: List[Awaitable], timeout: Optional[float]) -> list:
+    # gather cancels every child task if it is itself cancelled or timed out
+    return await asyncio.wait_for(asyncio.gather(*aws), timeout)
@@ -11,13 +11,16 @@ Assumptions:
 
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+
+from universe import UniverseStore
 
 
 def run_backtest(
     price_df: pd.DataFrame,
     weights: Dict[str, float],
-    rebalance_freq: str = "ME"
+    rebalance_freq: str = "ME",
+    universe: Optional[UniverseStore] = None
 ) -> pd.DataFrame:
     """
     Runs a backtest of a weighted stock portfolio with periodic rebalancing.
@@ -26,30 +29,44 @@ def run_backtest(
         price_df (pd.DataFrame): Daily adjusted close prices with tickers as columns.
         weights (Dict[str, float]): Dictionary of {ticker: weight}.
         rebalance_freq (str): Rebalance frequency ('ME' = monthly, 'QE' = quarterly).
+        universe (UniverseStore): Optional membership; a ticker's weight is held
+            in cash on dates it is not eligible.
 
     Returns:
         pd.DataFrame: Backtest results with equity curve and daily returns.
     """
     tickers = list(weights.keys())
-    price_df = price_df[tickers].dropna()
+    if universe is None:
+        price_df = price_df[tickers].dropna()
+    else:
+        # tickers may legitimately have no prices outside their membership
+        price_df = price_df[tickers].dropna(how="all")
 
     # calculate normalized prices (starting at 1)
     norm_prices = price_df / price_df.iloc[0]
 
     # calculate periodic returns
     periodic_prices = norm_prices.resample(rebalance_freq).first()
-    weight_df = pd.DataFrame(index=periodic_prices.index, columns=tickers)
-    for date in periodic_prices.index:
-        weight_df.loc[date] = weights
+    weight_row = np.array([weights[ticker] for ticker in tickers], dtype=price_df.dtypes.iloc[0])
+    weight_df = pd.DataFrame(
+        np.tile(weight_row, (len(periodic_prices.index), 1)),
+        index=periodic_prices.index,
+        columns=tickers
+    )
 
     # forward-fill weights and align with price index
     weight_df = weight_df.ffill().reindex(price_df.index).ffill()
 
+    # drop weights of tickers that are not eligible on a given date
+    if universe is not None:
+        weight_df = weight_df.where(universe.mask(price_df.index, tickers).to_numpy(), 0)
+
     # calculate daily returns
     daily_returns = price_df.pct_change().fillna(0)
 
-    # portfolio returns
-    portfolio_returns = (daily_returns * weight_df).sum(axis=1)
+    # portfolio returns (prices may be float32 in compact mode, but the
+    # compounded equity curve is always accumulated in float64)
+    portfolio_returns = (daily_returns * weight_df).sum(axis=1).astype(np.float64)
 
     # calculate cumulative equity curve
     equity_curve = (1 + portfolio_returns).cumprod()
@@ -0,0 +1,5 @@
+"""
+Benchmark scripts, run from the repository root, e.g.:
+
+    python -m benchmarks.bench_precision
+"""
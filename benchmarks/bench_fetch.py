@@ -0,0 +1,102 @@
+"""
+Benchmarks end-to-end fetch time against replayed provider responses.
+
+Fixtures are recorded once from the deterministic FakeProvider (or taken
+from --fixtures), then replayed with simulated latency and failures while
+varying chunk size, concurrency and caching.
+
+Usage:
+    python -m benchmarks.bench_fetch [--tickers 500] [--latency 0.2] [--failure-rate 0.05]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from data_fetcher import fetch_fundamentals, fetch_price_data
+from providers import FakeProvider
+from replay import RecordingProvider, ReplayProvider
+
+START, END = "2015-01-01", "2025-01-01"
+
+
+def record_fixtures(fixture_dir: str, tickers: list) -> None:
+    recorder = RecordingProvider(FakeProvider(), fixture_dir)
+    fetch_price_data(tickers, START, END, provider=recorder)
+    fetch_fundamentals(tickers, provider=recorder)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--fixtures", default=None, help="existing fixture directory")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per request")
+    parser.add_argument("--latency-per-ticker", type=float, default=0.002)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    # retries are expected here, so keep the failure warnings out of the output
+    logging.getLogger("data_fetcher").setLevel(logging.ERROR)
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    workdir = tempfile.mkdtemp(prefix="bench-fetch-")
+    try:
+        fixture_dir = args.fixtures
+        if fixture_dir is None:
+            fixture_dir = os.path.join(workdir, "fixtures")
+            record_fixtures(fixture_dir, tickers)
+        run(args, tickers, fixture_dir, os.path.join(workdir, "price-cache"))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run(args: argparse.Namespace, tickers: list, fixture_dir: str, cache_dir: str) -> None:
+    def replay(seed: int) -> ReplayProvider:
+        return ReplayProvider(
+            fixture_dir,
+            latency=args.latency,
+            latency_per_ticker=args.latency_per_ticker,
+            jitter=0.5,
+            failure_rate=args.failure_rate,
+            seed=seed
+        )
+
+    print(f"{len(tickers)} tickers, latency {args.latency}s + {args.latency_per_ticker}s/ticker, "
+          f"failure rate {args.failure_rate:.0%}")
+    print(f"{'scenario':<40}{'seconds':>9}{'requests':>10}{'failures':>10}")
+
+    def report(name: str, provider: ReplayProvider, fn) -> None:
+        began = time.perf_counter()
+        fn(provider)
+        elapsed = time.perf_counter() - began
+        print(f"{name:<40}{elapsed:>9.2f}{provider.requests:>10}{provider.failures:>10}")
+
+    for chunk_size, workers in [(len(tickers), 1), (100, 1), (100, 4), (50, 8)]:
+        report(
+            f"prices chunk={chunk_size} workers={workers}",
+            replay(seed=chunk_size + workers),
+            lambda p: fetch_price_data(tickers, START, END, provider=p, chunk_size=chunk_size, max_workers=workers)
+        )
+
+    for label in ("cold", "warm"):
+        report(
+            f"prices cached ({label})",
+            replay(seed=1),
+            lambda p: fetch_price_data(tickers, START, END, provider=p, cache_dir=cache_dir,
+                                       chunk_size=100, max_workers=4)
+        )
+
+    sample = tickers[:100]
+    for workers in (1, 8, 32):
+        report(
+            f"fundamentals x{len(sample)} workers={workers}",
+            replay(seed=workers),
+            lambda p: fetch_fundamentals(sample, provider=p, max_workers=workers)
+        )
+
+
+if __name__ == "__main__":
+    main()
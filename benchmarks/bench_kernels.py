@@ -0,0 +1,78 @@
+"""
+Benchmarks the rolling kernels in `kernels` against pandas.
+
+For each universe size, times every kernel on a synthetic return panel
+and the equivalent pandas rolling/ewm call, and reports the largest
+difference between the two. The NumPy fallback is always timed; the
+numba kernels are timed as well when numba is installed (the first
+call, which compiles, is excluded).
+
+Usage:
+    python -m benchmarks.bench_kernels [--dates 2520] [--tickers 10 1000 10000] [--window 126]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import kernels
+
+from benchmarks.common import best_time, synthetic_prices
+
+
+def cases(returns: pd.DataFrame, market: pd.Series, window: int) -> dict:
+    values = returns.to_numpy()
+    rolling = returns.rolling(window)
+    return {
+        "rolling_sum": (lambda: kernels.rolling_sum(values, window), lambda: rolling.sum()),
+        "rolling_mean": (lambda: kernels.rolling_mean(values, window), lambda: rolling.mean()),
+        "rolling_std": (lambda: kernels.rolling_std(values, window), lambda: rolling.std()),
+        "rolling_min": (lambda: kernels.rolling_min(values, window), lambda: rolling.min()),
+        "rolling_max": (lambda: kernels.rolling_max(values, window), lambda: rolling.max()),
+        "ewma": (lambda: kernels.ewma(values, span=window), lambda: returns.ewm(span=window).mean()),
+        "rolling_beta": (
+            lambda: kernels.rolling_beta(values, market.to_numpy(), window),
+            lambda: rolling.cov(market).div(market.rolling(window).var(), axis=0)
+        ),
+    }
+
+
+def run(n_dates: int, n_tickers: int, window: int) -> None:
+    returns = synthetic_prices(n_dates, n_tickers).pct_change()
+    market = returns.mean(axis=1)
+    backends = ["numpy"] + (["numba"] if kernels.HAVE_NUMBA else [])
+
+    print(f"\n{n_dates} dates x {n_tickers} tickers, window {window}")
+    print(f"{'kernel':<14}{'pandas (s)':>11}" + "".join(f"{b + ' (s)':>12}{'speedup':>9}" for b in backends)
+          + f"{'max diff':>11}")
+
+    for name, (kernel, reference) in cases(returns, market, window).items():
+        pandas_s = best_time(reference)
+        expected = reference().to_numpy()
+        line = f"{name:<14}{pandas_s:>11.4f}"
+        diff = 0.0
+        for backend in backends:
+            kernels.USE_NUMBA = backend == "numba"
+            kernel()  # compile / warm up
+            seconds = best_time(kernel)
+            diff = max(diff, float(np.nanmax(np.abs(kernel() - expected), initial=0.0)))
+            line += f"{seconds:>12.4f}{pandas_s / seconds:>8.1f}x"
+        kernels.USE_NUMBA = kernels.HAVE_NUMBA
+        print(line + f"{diff:>11.1e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dates", type=int, default=2520)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--window", type=int, default=126)
+    args = parser.parse_args()
+
+    print(f"numba {'available' if kernels.HAVE_NUMBA else 'not installed, NumPy fallback only'}")
+    for n_tickers in args.tickers:
+        run(args.dates, n_tickers, args.window)
+
+
+if __name__ == "__main__":
+    main()
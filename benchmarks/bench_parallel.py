@@ -0,0 +1,52 @@
+"""
+Benchmarks factor panel computation sharded across processes.
+
+Times `factor_model.compute_factor_panel` in this process and
+`parallel_factors.compute_factor_panel_parallel` with an increasing
+number of workers, and checks that every run gives the same panel.
+Speedup is only meaningful up to the number of physical cores.
+
+Usage:
+    python -m benchmarks.bench_parallel [--dates 2520] [--tickers 10000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from factor_model import compute_factor_panel
+from parallel_factors import compute_factor_panel_parallel
+
+from benchmarks.common import best_time, synthetic_fundamentals, synthetic_prices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dates", type=int, default=2520)
+    parser.add_argument("--tickers", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dtype", default="float64")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    prices = synthetic_prices(args.dates, args.tickers, args.dtype)
+    fundamentals = synthetic_fundamentals(list(prices.columns))
+    print(f"{args.dates} dates x {args.tickers} tickers, {os.cpu_count()} CPUs")
+
+    expected = compute_factor_panel(prices, fundamentals).values
+    serial_s = best_time(lambda: compute_factor_panel(prices, fundamentals), args.repeat)
+    print(f"{'workers':<10}{'seconds':>9}{'speedup':>9}{'max diff':>11}")
+    print(f"{'serial':<10}{serial_s:>9.2f}{1.0:>8.1f}x{0.0:>11.1e}")
+
+    for workers in args.workers:
+        def run():
+            return compute_factor_panel_parallel(prices, fundamentals, workers=workers)
+
+        seconds = best_time(run, args.repeat)
+        diff = float(np.nanmax(np.abs(run().values - expected), initial=0.0))
+        print(f"{workers:<10}{seconds:>9.2f}{serial_s / seconds:>8.1f}x{diff:>11.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmarks the float32 compact mode against float64.
+
+For each universe size, times the vectorized passes used by the
+pipeline (returns, rolling volatility, factor computation, backtest)
+in both precisions and reports how far the float32 results drift
+from float64.
+
+Usage:
+    python -m benchmarks.bench_precision [--dates 2520] [--tickers 100 1000 3000]
+"""
+
+import argparse
+
+import numpy as np
+
+from backtest import run_backtest
+from evaluation import calculate_sharpe
+from factor_model import compute_factors
+
+from benchmarks.common import best_time, synthetic_fundamentals, synthetic_prices
+
+
+def run(n_dates: int, n_tickers: int, window: int = 126) -> None:
+    prices64 = synthetic_prices(n_dates, n_tickers, "float64")
+    prices32 = prices64.astype("float32")
+    fundamentals = synthetic_fundamentals(list(prices64.columns))
+    weights = {ticker: 1 / 20 for ticker in prices64.columns[:20]}
+
+    print(f"\n{n_dates} dates x {n_tickers} tickers "
+          f"({prices64.memory_usage().sum() / 1e6:.0f} MB float64, "
+          f"{prices32.memory_usage().sum() / 1e6:.0f} MB float32)")
+    print(f"{'step':<22}{'float64 (s)':>12}{'float32 (s)':>12}{'speedup':>9}")
+
+    steps = {
+        "pct_change": lambda df: df.pct_change(),
+        "rolling std": lambda df: df.pct_change().rolling(window).std(),
+        "compute_factors": lambda df: compute_factors(df, fundamentals, momentum_window=window),
+        "run_backtest": lambda df: run_backtest(df, weights),
+    }
+    for name, step in steps.items():
+        t64 = best_time(lambda: step(prices64))
+        t32 = best_time(lambda: step(prices32))
+        print(f"{name:<22}{t64:>12.4f}{t32:>12.4f}{t64 / t32:>8.2f}x")
+
+    returns64 = prices64.pct_change().to_numpy()
+    returns32 = prices32.pct_change().to_numpy()
+    factors64 = compute_factors(prices64, fundamentals, momentum_window=window)
+    factors32 = compute_factors(prices32, fundamentals, momentum_window=window)
+    result64 = run_backtest(prices64, weights)
+    result32 = run_backtest(prices32, weights)
+
+    print("accuracy (float32 vs float64):")
+    print(f"  max abs return error    {np.nanmax(np.abs(returns32 - returns64)):.2e}")
+    print(f"  max abs factor z error  {(factors32 - factors64).abs().max().max():.2e}")
+    print(f"  final equity rel error  "
+          f"{abs(result32['PortfolioValue'].iloc[-1] / result64['PortfolioValue'].iloc[-1] - 1):.2e}")
+    print(f"  sharpe abs error        "
+          f"{abs(calculate_sharpe(result32['DailyReturn']) - calculate_sharpe(result64['DailyReturn'])):.2e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dates", type=int, default=2520)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[100, 1000, 3000])
+    args = parser.parse_args()
+
+    for n_tickers in args.tickers:
+        run(args.dates, n_tickers)
+
+
+if __name__ == "__main__":
+    main()
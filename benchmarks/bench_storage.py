@@ -0,0 +1,224 @@
+"""
+Benchmarks storage formats for price panels.
+
+Each format is written once and then read back in four ways:
+- full: the whole dates x tickers panel
+- projected: 10% of the tickers over the last year, evenly spaced
+- scattered: the same number of randomly chosen tickers over the last
+  year, which a memmap cannot serve as a strided view
+- cache: per-ticker files, as laid out by `price_cache.PriceCache`,
+  reading the projected tickers one file each
+
+For every format the file size, write time, read time and throughput,
+and the peak resident memory of each read are reported. Peak memory is
+measured in a fresh worker process per read, so allocations made by
+Arrow's own memory pool are counted too.
+
+Formats: Parquet (snappy, zstd, uncompressed), Feather (lz4, zstd,
+uncompressed), NPY memmap (`panel_store.PanelStore`) and HDF5 (pandas
+HDFStore, only when PyTables is installed).
+
+Usage:
+    python -m benchmarks.bench_storage [--dates 5040] [--tickers 2000] [--cache-dir .cache/prices]
+"""
+
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from panel_store import PanelStore
+from price_cache import PriceCache
+
+from benchmarks.common import best_time, synthetic_prices
+
+
+class Format(NamedTuple):
+    suffix: str
+    write: Callable[[pd.DataFrame, str], None]
+    read: Callable[[str, Optional[List[str]], Optional[str]], pd.DataFrame]
+
+
+def _write_parquet(compression: Optional[str]) -> Callable[[pd.DataFrame, str], None]:
+    def write(df: pd.DataFrame, path: str) -> None:
+        df.to_parquet(path, compression=compression)
+    return write
+
+
+def _read_parquet(path: str, tickers: Optional[List[str]], start: Optional[str]) -> pd.DataFrame:
+    columns = None if tickers is None else ["Date"] + tickers
+    filters = None if start is None else [("Date", ">=", pd.Timestamp(start))]
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def _write_feather(compression: str) -> Callable[[pd.DataFrame, str], None]:
+    def write(df: pd.DataFrame, path: str) -> None:
+        feather.write_feather(df.reset_index(), path, compression=compression)
+    return write
+
+
+def _read_feather(path: str, tickers: Optional[List[str]], start: Optional[str]) -> pd.DataFrame:
+    # uncompressed files are memory-mapped; compressed ones are decoded per column
+    columns = None if tickers is None else ["Date"] + tickers
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    if start is not None:
+        table = table.filter(pa.compute.greater_equal(table["Date"], pa.scalar(pd.Timestamp(start))))
+    return table.to_pandas().set_index("Date")
+
+
+def _write_npy(df: pd.DataFrame, path: str) -> None:
+    PanelStore.write(path, df, dtype=df.dtypes.iloc[0])
+
+
+def _read_npy(path: str, tickers: Optional[List[str]], start: Optional[str]) -> pd.DataFrame:
+    # copy so the pages are actually read, as with the other formats
+    return PanelStore(path).frame(tickers, start).copy()
+
+
+def _write_hdf(df: pd.DataFrame, path: str) -> None:
+    df.to_hdf(path, key="prices", mode="w", format="fixed", complevel=5, complib="blosc:zstd")
+
+
+def _read_hdf(path: str, tickers: Optional[List[str]], start: Optional[str]) -> pd.DataFrame:
+    # the fixed layout has no column or row pushdown; project after reading
+    df = pd.read_hdf(path, key="prices")
+    if tickers is not None:
+        df = df[tickers]
+    return df if start is None else df.loc[start:]
+
+
+FORMATS: Dict[str, Format] = {
+    "parquet-snappy": Format(".parquet", _write_parquet("snappy"), _read_parquet),
+    "parquet-zstd": Format(".parquet", _write_parquet("zstd"), _read_parquet),
+    "parquet-none": Format(".parquet", _write_parquet(None), _read_parquet),
+    "feather-lz4": Format(".feather", _write_feather("lz4"), _read_feather),
+    "feather-zstd": Format(".feather", _write_feather("zstd"), _read_feather),
+    "feather-none": Format(".feather", _write_feather("uncompressed"), _read_feather),
+    "npy-memmap": Format("", _write_npy, _read_npy),
+}
+
+if importlib.util.find_spec("tables") is not None:
+    FORMATS["hdf5-zstd"] = Format(".h5", _write_hdf, _read_hdf)
+
+
+def _read_cache(name: str, root: str, tickers: List[str], start: Optional[str]) -> None:
+    read = FORMATS[name].read
+    for ticker in tickers:
+        read(os.path.join(root, ticker + FORMATS[name].suffix), None, start)
+
+
+def _high_water_mark() -> int:
+    # VmHWM belongs to the process image, whereas ru_maxrss is carried over
+    # from the parent across fork/exec and would hide the worker's own peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _peak_worker(target: Callable, args: tuple, queue) -> None:
+    before = _high_water_mark()
+    target(*args)
+    queue.put(max(_high_water_mark() - before, 0))
+
+
+def _read_panel(name: str, path: str, tickers: Optional[List[str]], start: Optional[str]) -> None:
+    FORMATS[name].read(path, tickers, start)
+
+
+def peak_memory(target: Callable, *args) -> int:
+    """
+    Returns the peak resident memory in bytes added by `target(*args)`,
+    measured in a fresh worker process.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    worker = ctx.Process(target=_peak_worker, args=(target, args, queue))
+    worker.start()
+    peak = queue.get()
+    worker.join()
+    return peak
+
+
+def dir_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run(df: pd.DataFrame, workdir: str, repeat: int) -> None:
+    tickers = list(df.columns)
+    projected = tickers[::10]
+    rng = np.random.default_rng(0)
+    scattered = [tickers[i] for i in rng.permutation(len(tickers))[:len(projected)]]
+    start = (df.index[-1] - pd.DateOffset(years=1)).strftime("%Y-%m-%d")
+    raw_mb = df.memory_usage().sum() / 1e6
+
+    print(f"\n{len(df)} dates x {len(tickers)} tickers ({raw_mb:.0f} MB in memory), "
+          f"projection {len(projected)} tickers from {start}")
+    print(f"{'format':<16}{'size MB':>9}{'write s':>9}{'full s':>8}{'MB/s':>7}{'peak MB':>9}"
+          f"{'proj s':>8}{'peak MB':>9}{'scat s':>8}{'peak MB':>9}{'cache s':>9}{'peak MB':>9}")
+
+    for name, fmt in FORMATS.items():
+        path = os.path.join(workdir, name + fmt.suffix)
+        began = time.perf_counter()
+        fmt.write(df, path)
+        write_s = time.perf_counter() - began
+
+        # per-ticker files, as in the price cache
+        cache_root = os.path.join(workdir, name + "-cache")
+        os.makedirs(cache_root, exist_ok=True)
+        for ticker in projected:
+            fmt.write(df[[ticker]], os.path.join(cache_root, ticker + fmt.suffix))
+
+        full_s = best_time(lambda: fmt.read(path, None, None), repeat)
+        proj_s = best_time(lambda: fmt.read(path, projected, start), repeat)
+        scat_s = best_time(lambda: fmt.read(path, scattered, start), repeat)
+        cache_s = best_time(lambda: _read_cache(name, cache_root, projected, start), repeat)
+
+        print(f"{name:<16}{dir_size(path) / 1e6:>9.1f}{write_s:>9.2f}{full_s:>8.2f}{raw_mb / full_s:>7.0f}"
+              f"{peak_memory(_read_panel, name, path, None, None) / 1e6:>9.0f}"
+              f"{proj_s:>8.3f}{peak_memory(_read_panel, name, path, projected, start) / 1e6:>9.0f}"
+              f"{scat_s:>8.3f}{peak_memory(_read_panel, name, path, scattered, start) / 1e6:>9.0f}"
+              f"{cache_s:>9.3f}{peak_memory(_read_cache, name, cache_root, projected, start) / 1e6:>9.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dates", type=int, default=5040)
+    parser.add_argument("--tickers", type=int, default=2000)
+    parser.add_argument("--dtype", default="float64")
+    parser.add_argument("--cache-dir", default=None, help="also benchmark the panel held in a PriceCache")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-storage-")
+    try:
+        run(synthetic_prices(args.dates, args.tickers, args.dtype), workdir, args.repeat)
+
+        if args.cache_dir is not None:
+            cache = PriceCache(args.cache_dir, download=None)
+            cached = cache.read(cache.tickers).astype(args.dtype)
+            shutil.rmtree(workdir)
+            os.makedirs(workdir)
+            run(cached, workdir, args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
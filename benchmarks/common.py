@@ -0,0 +1,61 @@
+"""
+Shared helpers for the benchmark scripts: synthetic panels and timing.
+"""
+
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_prices(
+    n_dates: int,
+    n_tickers: int,
+    dtype: str = "float64",
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generates a geometric random-walk price panel on business days.
+
+    Args:
+        n_dates (int): Number of rows.
+        n_tickers (int): Number of ticker columns.
+        dtype (str): dtype of the returned prices.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Prices with date as index and tickers as columns.
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0.0003, 0.02, size=(n_dates, n_tickers))
+    prices = 100 * np.exp(np.cumsum(log_returns, axis=0))
+    index = pd.bdate_range("2000-01-03", periods=n_dates, name="Date")
+    columns = [f"T{i:05d}" for i in range(n_tickers)]
+    return pd.DataFrame(prices.astype(dtype), index=index, columns=columns)
+
+
+def synthetic_fundamentals(tickers: list, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates a fundamentals frame matching `data_fetcher.fetch_fundamentals`.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(tickers)
+    return pd.DataFrame({
+        "marketCap": np.exp(rng.uniform(np.log(1e9), np.log(3e12), n)),
+        "trailingPE": rng.uniform(5, 60, n),
+        "priceToBook": rng.uniform(0.5, 20, n),
+        "dividendYield": rng.uniform(0, 0.05, n),
+    }, index=pd.Index(tickers, name="ticker"))
+
+
+def best_time(fn: Callable[[], object], repeat: int = 3) -> float:
+    """
+    Returns the best wall-clock time in seconds over `repeat` calls.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return best
@@ -9,10 +9,47 @@ TICKERS = [
     "TSLA", "JPM", "V", "JNJ", "NVDA"
 ]
 
+# time-varying universe membership (UniverseStore .npz file); when set,
+# its tickers replace TICKERS and only eligible tickers are ranked/held
+UNIVERSE_PATH = None
+
 # backtest dates
 START_DATE = "2020-01-01"
 END_DATE   = "2024-12-31"
 
+# data source: "yfinance", "parquet", "csv", "fake" or "replay"
+DATA_PROVIDER = "yfinance"
+DATA_DIR = "data"                   # dataset/fixture root for the local providers
+RECORD_FIXTURES_DIR = None          # set to record provider responses for replay
+
+# data caching (use a separate cache directory per provider)
+PRICE_CACHE_DIR = ".cache/prices"  # set to None to always download
+PRICE_CACHE_REFRESH = False         # only append bars after the cached range
+PRICE_CACHE_FORMAT = "feather"      # segment format, "feather" (zstd) or "parquet"
+
+# price downloads
+PRICE_CHUNK_SIZE = 200              # tickers per provider request
+PRICE_MAX_WORKERS = 4               # concurrent chunk downloads
+
+# numeric precision of price/return panels: "float64", or "float32" to
+# halve memory for large universes (equity curves and Sharpe ratios are
+# always accumulated in float64)
+PRICE_DTYPE = "float64"
+
+# data-quality checks on the price panel
+VALIDATE_PRICES = True
+STALE_PRICE_DAYS = 5                # identical consecutive closes flagged as stale
+OUTLIER_ZSCORE = 10.0               # robust z-score of a daily log return
+ADJUST_SPLITS = False               # back-adjust split candidates; off for split-adjusted
+                                    # sources like yfinance, where candidates are only reported
+
+# fundamentals fetching
+FUNDAMENTALS_MAX_WORKERS = 8        # concurrent requests
+FUNDAMENTALS_RATE_LIMIT = 5.0       # requests per second, None for unlimited
+FUNDAMENTALS_MAX_RETRIES = 3
+FUNDAMENTALS_CACHE_PATH = ".cache/fundamentals.json"  # None to disable
+FUNDAMENTALS_PIT_PATH = ".cache/fundamentals_pit.parquet"  # point-in-time history, None to disable
+
 # factor parameters
 MOMENTUM_LOOKBACK_DAYS = 126  # 6 months
 TOP_N_STOCKS = 5
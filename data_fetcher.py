@@ -1,30 +1,215 @@
 """
 Module for fetching historical price and fundamental data
-for a list of stock tickers using yfinance.
+for a list of stock tickers.
+
+Data is read through a `providers.DataProvider`; yfinance is used
+unless another provider is passed in.
 """
 
-import yfinance as yf
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fundamentals_cache import FundamentalsCache
+from price_cache import PriceCache
+from providers import DataProvider, YFinanceProvider
+from singleflight import SingleFlight
+from throttle import TokenBucket, retry_with_backoff
+
+logger = logging.getLogger(__name__)
+
+# coalesces identical in-flight provider requests across threads
+_inflight = SingleFlight()
 
+FUNDAMENTAL_FIELDS = ["marketCap", "trailingPE", "priceToBook", "dividendYield"]
 
-def fetch_price_data(tickers: List[str], start: str, end: str) -> pd.DataFrame:
+
+class ChunkTiming(NamedTuple):
+    chunk: int
+    tickers: int
+    rows: int
+    seconds: float
+
+
+def fetch_price_data(
+    tickers: List[str],
+    start: str,
+    end: str,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+    provider: Optional[DataProvider] = None,
+    chunk_size: int = 200,
+    max_workers: int = 4,
+    dtype: str = "float64",
+    cache_format: str = "feather"
+) -> pd.DataFrame:
     """
     Fetches adjusted close price data for the given tickers.
 
+    If a cache directory is given, prices are served from the on-disk
+    cache and only date ranges not yet cached are downloaded. With
+    `refresh=True`, only bars after the covered range of each ticker (and
+    any missing head before it) are downloaded and appended to the cache.
+
+    Large universes are downloaded in chunks of `chunk_size` tickers,
+    with up to `max_workers` chunks in flight at once. Duplicate tickers
+    are dropped, keeping the first occurrence.
+
+    Concurrent identical calls (and identical provider downloads) within
+    the process are coalesced into one fetch whose result is shared, so
+    the returned frame must not be modified in place.
+
     Args:
         tickers (List[str]): List of stock tickers.
         start (str): Start date in 'YYYY-MM-DD'.
         end (str): End date in 'YYYY-MM-DD'.
+        cache_dir (str): Optional directory for the persistent price cache.
+        refresh (bool): Incrementally append new bars instead of filling coverage gaps.
+        provider (DataProvider): Data source, defaults to yfinance.
+        chunk_size (int): Maximum number of tickers per provider request.
+        max_workers (int): Maximum number of chunks downloaded concurrently.
+        dtype (str): Price dtype, 'float64' or 'float32' for compact mode.
+        cache_format (str): File format of new cache segments, 'feather' or 'parquet'.
 
     Returns:
         pd.DataFrame: DataFrame with date as index and tickers as columns.
     """
-    df = yf.download(tickers, start=start, end=end, auto_adjust=False)["Close"]
-    return df.dropna(how="all")
+    tickers = list(dict.fromkeys(tickers))  # one column per ticker, in first-seen order
+    provider = provider or YFinanceProvider()
+    download = _price_download(provider, chunk_size, max_workers)
+
+    def load() -> pd.DataFrame:
+        if cache_dir is not None:
+            cache = PriceCache(cache_dir, download, file_format=cache_format)
+            if refresh:
+                df = cache.refresh(tickers, start, end)
+            else:
+                df = cache.get(tickers, start, end)
+        else:
+            df = download(tickers, start, end)
+        return df.dropna(how="all").astype(dtype)
+
+    key = ("price_panel", provider.key(), tuple(tickers), start, end, cache_dir, refresh, dtype)
+    return _inflight.do(key, load)
+
+
+def open_price_cache(
+    cache_dir: str,
+    provider: Optional[DataProvider] = None,
+    chunk_size: int = 200,
+    max_workers: int = 4,
+    cache_format: str = "feather"
+) -> PriceCache:
+    """
+    Returns a `PriceCache` that downloads missing ranges the way
+    `fetch_price_data` does: in chunks, coalesced across threads.
+
+    Useful for filling coverage once and then reading projections
+    (`read`, `read_last`) without materializing the whole panel.
+    """
+    download = _price_download(provider or YFinanceProvider(), chunk_size, max_workers)
+    return PriceCache(cache_dir, download, file_format=cache_format)
+
+
+def _price_download(
+    provider: DataProvider,
+    chunk_size: int,
+    max_workers: int
+) -> Callable[[List[str], str, str], pd.DataFrame]:
+    def download(batch: List[str], batch_start: str, batch_end: str) -> pd.DataFrame:
+        def request() -> pd.DataFrame:
+            df, _ = download_in_chunks(
+                provider.get_prices, batch, batch_start, batch_end,
+                chunk_size=chunk_size, max_workers=max_workers
+            )
+            return df
+
+        key = ("prices", provider.key(), tuple(batch), batch_start, batch_end)
+        return _inflight.do(key, request)
+
+    return download
+
+
+def download_in_chunks(
+    download: Callable[[List[str], str, str], pd.DataFrame],
+    tickers: List[str],
+    start: str,
+    end: str,
+    chunk_size: int = 200,
+    max_workers: int = 4,
+    max_retries: int = 2
+) -> Tuple[pd.DataFrame, List[ChunkTiming]]:
+    """
+    Downloads a large universe in parallel chunks and stitches the result.
+
+    Chunks are written straight into one preallocated array aligned on
+    the union of all chunk dates, so the panel is assembled with a single
+    allocation instead of repeated concatenation.
+
+    Args:
+        download (Callable): (tickers, start, end) -> close panel, e.g. `DataProvider.get_prices`.
+        tickers (List[str]): List of stock tickers.
+        start (str): Start date in 'YYYY-MM-DD'.
+        end (str): End date in 'YYYY-MM-DD'.
+        chunk_size (int): Maximum number of tickers per request.
+        max_workers (int): Maximum number of chunks in flight.
+        max_retries (int): Retries per chunk after the first attempt.
+
+    Returns:
+        Tuple[pd.DataFrame, List[ChunkTiming]]: Close panel with tickers as
+        columns, and the timing of each chunk.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    chunk_size = max(1, chunk_size)
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+    def fetch_chunk(i: int) -> Tuple[pd.DataFrame, ChunkTiming]:
+        began = time.perf_counter()
+        df = retry_with_backoff(lambda: download(chunks[i], start, end), max_retries=max_retries)
+        if isinstance(df, pd.Series):
+            df = df.to_frame(name=chunks[i][0])
+        timing = ChunkTiming(i, len(chunks[i]), len(df), time.perf_counter() - began)
+        logger.info(
+            "Price chunk %d/%d: %d tickers, %d rows in %.2fs",
+            i + 1, len(chunks), timing.tickers, timing.rows, timing.seconds
+        )
+        return df, timing
 
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks) or 1))) as pool:
+        results = list(pool.map(fetch_chunk, range(len(chunks))))
 
-def fetch_fundamentals(tickers: List[str]) -> pd.DataFrame:
+    frames = [df for df, _ in results]
+    timings = [timing for _, timing in results]
+
+    index = pd.DatetimeIndex([])
+    for df in frames:
+        index = index.union(pd.DatetimeIndex(df.index))
+
+    values = np.full((len(index), len(tickers)), np.nan)
+    positions = {ticker: j for j, ticker in enumerate(tickers)}
+    for df in frames:
+        rows = index.get_indexer(df.index)
+        known = [c for c in df.columns if c in positions]
+        cols = [positions[c] for c in known]
+        values[np.ix_(rows, cols)] = df[known].to_numpy(dtype="float64")
+
+    panel = pd.DataFrame(values, index=index, columns=tickers)
+    panel.index.name = "Date"
+    return panel, timings
+
+
+def fetch_fundamentals(
+    tickers: List[str],
+    max_workers: int = 8,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    cache: Optional[FundamentalsCache] = None,
+    provider: Optional[DataProvider] = None
+) -> pd.DataFrame:
     """
     Fetches basic fundamental metrics for each ticker.
 
@@ -34,21 +219,119 @@ def fetch_fundamentals(tickers: List[str]) -> pd.DataFrame:
         - Price-to-book ratio
         - Dividend yield
 
+    Tickers are fetched concurrently on a bounded thread pool. Each
+    ticker is retried with backoff; a ticker that still fails yields a
+    row of missing values instead of failing the whole batch. Concurrent
+    requests for the same ticker share a single provider call.
+
     Args:
         tickers (List[str]): List of stock tickers.
+        max_workers (int): Maximum number of concurrent requests.
+        requests_per_second (float): Optional rate limit shared by all workers.
+        max_retries (int): Retries per ticker after the first attempt.
+        cache (FundamentalsCache): Optional cache; only expired or missing tickers are fetched.
+        provider (DataProvider): Data source, defaults to yfinance.
 
     Returns:
         pd.DataFrame: DataFrame with fundamentals indexed by ticker.
     """
+    provider = provider or YFinanceProvider()
+    limiter = TokenBucket(requests_per_second) if requests_per_second else None
+
+    cached, to_fetch = lookup_cached_fundamentals(tickers, cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        infos = pool.map(lambda ticker: fetch_fundamental_info(provider, ticker, limiter, max_retries), to_fetch)
+        fetched = dict(zip(to_fetch, infos))
+
+    store_fundamentals(fetched, cache)
+    return build_fundamentals_frame(tickers, cached, fetched)
+
+
+def fetch_fundamental_info(
+    provider: DataProvider,
+    ticker: str,
+    limiter: Optional[TokenBucket] = None,
+    max_retries: int = 3
+) -> Optional[dict]:
+    """
+    Fetches the raw fundamentals of one ticker with rate limiting and retries.
+
+    Concurrent requests for the same ticker share a single provider call.
+
+    Args:
+        provider (DataProvider): Data source.
+        ticker (str): Stock ticker.
+        limiter (TokenBucket): Optional rate limiter shared across requests.
+        max_retries (int): Retries after the first attempt.
+
+    Returns:
+        dict: Raw provider fields, or None if every attempt failed.
+    """
+    def request() -> dict:
+        if limiter is not None:
+            limiter.acquire()
+        return provider.get_fundamentals(ticker)
+
+    try:
+        return _inflight.do(
+            ("fundamentals", provider.key(), ticker),
+            lambda: retry_with_backoff(request, max_retries=max_retries)
+        )
+    except Exception as exc:
+        logger.warning("Failed to fetch fundamentals for %s: %s", ticker, exc)
+        return None
+
+
+def lookup_cached_fundamentals(
+    tickers: List[str],
+    cache: Optional[FundamentalsCache]
+) -> Tuple[Dict[str, dict], List[str]]:
+    """
+    Splits tickers into cache hits and the unique tickers still to fetch.
+
+    Returns:
+        Tuple[Dict[str, dict], List[str]]: ({ticker: values} hits, tickers to fetch).
+    """
+    cached = {}
+    if cache is not None:
+        for ticker in tickers:
+            record = cache.get(ticker, FUNDAMENTAL_FIELDS)
+            if record is not None:
+                cached[ticker] = record
+    to_fetch = [ticker for ticker in dict.fromkeys(tickers) if ticker not in cached]
+    return cached, to_fetch
+
+
+def store_fundamentals(fetched: Dict[str, Optional[dict]], cache: Optional[FundamentalsCache]) -> None:
+    """
+    Adds successfully fetched tickers to the cache and persists it.
+    """
+    if cache is None:
+        return
+    for ticker, info in fetched.items():
+        # failures are not cached so they are retried on the next call
+        if info is not None:
+            cache.put(ticker, _fundamental_values(info))
+    cache.save()
+
+
+def build_fundamentals_frame(
+    tickers: List[str],
+    cached: Dict[str, dict],
+    fetched: Dict[str, Optional[dict]]
+) -> pd.DataFrame:
+    """
+    Assembles cached and fetched values into the fundamentals DataFrame.
+    """
     records = []
     for ticker in tickers:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        records.append({
-            "ticker": ticker,
-            "marketCap": info.get("marketCap", None),
-            "trailingPE": info.get("trailingPE", None),
-            "priceToBook": info.get("priceToBook", None),
-            "dividendYield": info.get("dividendYield", None)
-        })
-    return pd.DataFrame(records).set_index("ticker")
+        values = cached.get(ticker)
+        if values is None:
+            values = _fundamental_values(fetched.get(ticker) or {})
+        records.append({"ticker": ticker, **values})
+    return pd.DataFrame(records, columns=["ticker"] + FUNDAMENTAL_FIELDS).set_index("ticker")
+
+
+def _fundamental_values(info: dict) -> dict:
+    return {field: info.get(field, None) for field in FUNDAMENTAL_FIELDS}
@@ -0,0 +1,187 @@
+"""
+This module validates and adjusts a close-price panel before it reaches
+the factor model and the backtest.
+
+Checks:
+- Split-like jumps (price ratio close to 1/k or k for common split ratios)
+- Stale prices (the same price repeated for several days)
+- Outlier returns (robust z-score of log returns)
+- Gaps (missing prices between a ticker's first and last observation)
+
+Detected splits are turned into backward adjustment factors. All checks
+operate on the whole dates x tickers array at once; the only Python loop
+is over the handful of candidate split ratios.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# forward splits k-for-1 (price divided by k); reverse splits are their inverses
+SPLIT_RATIOS = (1.5, 2.0, 3.0, 4.0, 5.0, 8.0, 10.0, 15.0, 20.0)
+
+
+def validate_prices(
+    price_df: pd.DataFrame,
+    split_ratios: Sequence[float] = SPLIT_RATIOS,
+    split_tolerance: float = 0.01,
+    stale_days: int = 5,
+    outlier_zscore: float = 10.0,
+    adjust_splits: bool = True
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Runs the data-quality checks and applies split adjustments.
+
+    Args:
+        price_df (pd.DataFrame): Close prices with dates as index and tickers as columns.
+        split_ratios (Sequence[float]): Candidate split ratios (k for k-for-1 splits).
+        split_tolerance (float): Maximum log-distance between a day's price ratio and a
+            split ratio. Kept tight, since a wider band takes ordinary -35% or +50%
+            moves for 3-for-2 splits.
+        stale_days (int): Number of identical consecutive prices that counts as stale.
+        outlier_zscore (float): Robust z-score above which a return is an outlier;
+            split candidates must also exceed it, so ordinary moves are not taken as splits.
+        adjust_splits (bool): Whether to back-adjust prices for detected splits.
+            Leave off for split-adjusted sources (such as yfinance closes), where
+            every candidate is a genuine price move that adjusting would erase.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The (adjusted) price panel, and an
+        exceptions report with columns 'date', 'ticker', 'issue', 'value'.
+    """
+    prices = price_df.to_numpy(dtype="float64")
+    valid = ~np.isnan(prices)
+    prev = _previous_valid(prices, valid)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_ret = np.log(prices / prev)
+    zscore = _robust_zscore(log_ret)
+
+    # split-like jumps: extreme moves that match a split ratio. Only the
+    # (sparse) extreme moves are matched against the candidate ratios.
+    with np.errstate(invalid="ignore"):
+        extreme = np.nonzero(np.abs(zscore) > outlier_zscore)
+    split_factor = np.full(prices.shape, np.nan)
+    split_factor[extreme] = _match_splits(log_ret[extreme], split_ratios, split_tolerance)
+    is_split = ~np.isnan(split_factor)
+
+    if adjust_splits and is_split.any():
+        step = np.where(is_split, split_factor, 1.0)
+        # factor for row t is the product of all split steps after t
+        after = np.cumprod(step[::-1], axis=0)[::-1] / step
+        prices = prices * after
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_ret = np.log(prices / _previous_valid(prices, valid))
+        zscore = _robust_zscore(log_ret)
+
+    with np.errstate(invalid="ignore"):
+        is_outlier = (np.abs(zscore) > outlier_zscore) & ~is_split
+
+    # stale runs, reported once at the end of each run with its length
+    same = valid & (prices == prev)
+    stale_run = _run_length(same)
+    stale_end = same & (stale_run >= stale_days - 1) & ~_shift_up(same)
+
+    # gaps inside each ticker's observed range, reported at the last
+    # missing date with the gap length
+    rows = np.arange(len(prices))[:, np.newaxis]
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), len(prices))
+    last = len(prices) - 1 - valid[::-1].argmax(axis=0)
+    missing = ~valid & (rows > first) & (rows < last)
+    gap_run = _run_length(missing)
+    gap_end = missing & ~_shift_up(missing)
+
+    report = _exceptions_report(price_df, {
+        "split": (is_split, split_factor),
+        "outlier_return": (is_outlier, log_ret),
+        "stale_price": (stale_end, stale_run + 1),
+        "gap": (gap_end, gap_run),
+    })
+
+    adjusted = pd.DataFrame(prices, index=price_df.index, columns=price_df.columns)
+    return adjusted.astype(price_df.dtypes.iloc[0] if len(price_df.columns) else "float64"), report
+
+
+def _previous_valid(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Returns, for each cell, the last valid value strictly before it in its column.
+    """
+    rows = np.where(valid, np.arange(len(values))[:, np.newaxis], -1)
+    last_row = np.maximum.accumulate(rows, axis=0)
+
+    prev_row = np.empty_like(last_row)
+    prev_row[0] = -1
+    prev_row[1:] = last_row[:-1]
+
+    cols = np.arange(values.shape[1])[np.newaxis, :]
+    prev = values[np.maximum(prev_row, 0), cols]
+    prev[prev_row < 0] = np.nan
+    return prev
+
+
+def _robust_zscore(values: np.ndarray) -> np.ndarray:
+    """
+    Column-wise (x - median) / (1.4826 * MAD), ignoring NaNs.
+    """
+    if values.size == 0:
+        return values.copy()
+    with np.errstate(invalid="ignore"):
+        finite = np.where(np.isfinite(values), values, np.nan)
+        median = np.nanmedian(finite, axis=0)
+        mad = np.nanmedian(np.abs(finite - median), axis=0) * 1.4826
+        mad = np.where(mad > 0, mad, np.nan)
+        return (values - median) / mad
+
+
+def _match_splits(log_ret: np.ndarray, split_ratios: Sequence[float], tolerance: float) -> np.ndarray:
+    """
+    Returns the split price ratio closest to each log return, or NaN if
+    none is within `tolerance` (in log space).
+    """
+    matched = np.full(log_ret.shape, np.nan)
+    best = np.full(log_ret.shape, tolerance)
+    with np.errstate(invalid="ignore"):
+        for k in split_ratios:
+            for exact in (1.0 / k, k):
+                distance = np.abs(log_ret - np.log(exact))
+                closer = distance < best
+                matched[closer] = exact
+                best[closer] = distance[closer]
+    return matched
+
+
+def _run_length(flags: np.ndarray) -> np.ndarray:
+    """
+    Length of the current run of True values ending at each cell (0 where False).
+    """
+    counts = np.cumsum(flags, axis=0)
+    resets = np.maximum.accumulate(np.where(flags, 0, counts), axis=0)
+    return counts - resets
+
+
+def _shift_up(flags: np.ndarray) -> np.ndarray:
+    """
+    Returns flags[t + 1] at row t (False for the last row).
+    """
+    shifted = np.zeros_like(flags)
+    shifted[:-1] = flags[1:]
+    return shifted
+
+
+def _exceptions_report(
+    price_df: pd.DataFrame,
+    checks: Dict[str, Tuple[np.ndarray, np.ndarray]]
+) -> pd.DataFrame:
+    frames = []
+    for issue, (mask, values) in checks.items():
+        rows, cols = np.nonzero(mask)
+        frames.append(pd.DataFrame({
+            "date": price_df.index[rows],
+            "ticker": price_df.columns[cols],
+            "issue": issue,
+            "value": values[rows, cols].astype("float64"),
+        }))
+
+    report = pd.concat(frames, ignore_index=True)
+    return report.sort_values(["date", "ticker"], kind="stable", ignore_index=True)
@@ -56,7 +56,7 @@ def calculate_sharpe(returns: pd.Series, risk_free_rate: float = 0.0) -> float:
     Returns:
         float: Sharpe ratio (annualized).
     """
-    excess_returns = returns - risk_free_rate / 252
+    excess_returns = returns.astype(np.float64) - risk_free_rate / 252
     mean_return = excess_returns.mean()
     std_return = excess_returns.std()
     sharpe_ratio = np.sqrt(252) * mean_return / std_return
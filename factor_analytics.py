@@ -0,0 +1,259 @@
+"""
+This module measures how well factors predict forward returns.
+
+All statistics are computed for every date, factor and horizon at once
+from a `factor_model.FactorPanel` and the price history, as batched
+array operations over the (dates, tickers, factors) panel rather than a
+loop over dates:
+
+- IC:        cross-sectional Pearson correlation of factor and forward return
+- rank IC:   Spearman correlation (Pearson on average ranks)
+- decay:     mean rank IC as a function of the forward horizon
+- quantiles: mean forward return per factor quantile, and the spread of
+             the top over the bottom quantile
+- turnover:  share of the top quantile replaced from one date to the next
+
+Each statistic on a date uses only the tickers with both a factor value
+and a forward return. Forward returns at horizons longer than the
+spacing of the panel dates overlap, so their IC series are autocorrelated.
+"""
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from factor_model import FactorPanel
+from normalization import normalize_cross_section
+
+HORIZONS = (1, 5, 21, 63)   # trading days
+MIN_NAMES = 3               # fewest tickers for a cross-sectional statistic
+
+
+class FactorReport(NamedTuple):
+    """
+    Factor quality statistics; column levels are (horizon, factor).
+    """
+    ic: pd.DataFrame                 # dates x (horizon, factor)
+    rank_ic: pd.DataFrame            # dates x (horizon, factor)
+    decay: pd.DataFrame              # horizon x factor, mean rank IC
+    quantile_returns: pd.DataFrame   # quantile x (horizon, factor), mean over dates
+    spread: pd.DataFrame             # dates x (horizon, factor), top minus bottom quantile
+    turnover: pd.DataFrame           # dates x factor, top quantile turnover
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Returns IC and rank IC statistics per (horizon, factor).
+        """
+        return pd.concat({"ic": ic_summary(self.ic), "rank_ic": ic_summary(self.rank_ic)}, axis=1)
+
+
+def analyze_factors(
+    panel: FactorPanel,
+    price_df: pd.DataFrame,
+    horizons: Sequence[int] = HORIZONS,
+    quantiles: int = 5
+) -> FactorReport:
+    """
+    Computes IC, rank IC, IC decay, quantile returns and turnover.
+
+    Args:
+        panel (FactorPanel): Raw (or normalized) factors, e.g. from
+            `compute_factor_panel` at the rebalance dates.
+        price_df (pd.DataFrame): Daily prices with the panel's tickers as
+            columns; forward returns are measured from each panel date.
+        horizons (Sequence[int]): Forward horizons in trading days.
+        quantiles (int): Number of factor quantiles.
+
+    Returns:
+        FactorReport: The statistics for every date, horizon and factor.
+    """
+    horizons = tuple(int(h) for h in horizons)
+    returns = forward_returns(price_df[list(panel.tickers)], panel.dates, horizons)
+    columns = pd.MultiIndex.from_product([horizons, list(panel.factors)], names=["horizon", "factor"])
+    # (dates, factors, tickers), so every cross-sectional reduction runs
+    # over the contiguous last axis
+    values = _by_factor(panel.values)
+
+    ic, rank_ic, mean_quantiles, spread = [], [], [], []
+    for forward in returns:
+        factor, forward = _paired(values, forward)
+        ic.append(_correlation(factor, forward))
+        factor_pct, forward_pct = _percentiles(factor, forward)
+        rank_ic.append(_correlation(factor_pct, forward_pct))
+
+        by_quantile = _quantile_means(_buckets(factor_pct, quantiles), forward, quantiles)
+        counts = np.count_nonzero(~np.isnan(by_quantile), axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_quantiles.append(np.nansum(by_quantile, axis=0).T / counts.T)
+        spread.append(by_quantile[..., -1] - by_quantile[..., 0])
+
+    def frame(parts, index):
+        return pd.DataFrame(np.concatenate(parts, axis=-1), index=index, columns=columns)
+
+    rank_ic_df = frame(rank_ic, panel.dates)
+    decay = rank_ic_df.mean().unstack("factor").reindex(columns=list(panel.factors))
+    return FactorReport(
+        ic=frame(ic, panel.dates),
+        rank_ic=rank_ic_df,
+        decay=decay,
+        quantile_returns=frame(mean_quantiles, pd.RangeIndex(1, quantiles + 1, name="quantile")),
+        spread=frame(spread, panel.dates),
+        turnover=pd.DataFrame(
+            _turnover(values, quantiles), index=panel.dates, columns=list(panel.factors)
+        )
+    )
+
+
+def forward_returns(price_df: pd.DataFrame, dates: Sequence, horizons: Sequence[int]) -> np.ndarray:
+    """
+    Returns the simple return from each date over each horizon.
+
+    Args:
+        price_df (pd.DataFrame): Daily prices with tickers as columns.
+        dates (Sequence): Start dates; each uses the prices as of the last
+            trading day on or before it.
+        horizons (Sequence[int]): Horizons in trading days.
+
+    Returns:
+        np.ndarray: Array of shape (horizons, dates, tickers); NaN where
+        the start or end price is missing or beyond the price history.
+    """
+    prices = price_df.to_numpy(dtype=np.float64)
+    n_rows = len(prices)
+    rows = price_df.index.searchsorted(pd.DatetimeIndex(dates), side="right") - 1
+    # an extra all-NaN row stands in for prices outside the history
+    padded = np.vstack([prices, np.full((1, prices.shape[1]), np.nan)])
+    start = padded[np.where(rows >= 0, rows, n_rows)]
+
+    out = np.empty((len(horizons), len(rows), prices.shape[1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for k, horizon in enumerate(horizons):
+            end_rows = rows + horizon
+            end = padded[np.where((rows >= 0) & (end_rows < n_rows), end_rows, n_rows)]
+            np.divide(end, start, out=out[k])
+            out[k] -= 1
+    return out
+
+
+def information_coefficient(factor: np.ndarray, returns: np.ndarray, method: str = "spearman") -> np.ndarray:
+    """
+    Cross-sectional correlation of factor values with forward returns.
+
+    Args:
+        factor (np.ndarray): Factor values of shape (dates, tickers, factors).
+        returns (np.ndarray): Forward returns of shape (dates, tickers).
+        method (str): 'pearson' for the IC or 'spearman' for the rank IC.
+
+    Returns:
+        np.ndarray: Correlations of shape (dates, factors); NaN on dates
+        with fewer than `MIN_NAMES` paired values or no dispersion.
+    """
+    if method not in ("pearson", "spearman"):
+        raise ValueError(f"Unknown correlation method '{method}', expected 'pearson' or 'spearman'")
+    factor, forward = _paired(_by_factor(factor), returns)
+    if method == "spearman":
+        factor, forward = _percentiles(factor, forward)
+    return _correlation(factor, forward)
+
+
+def quantile_turnover(factor: np.ndarray, quantiles: int = 5) -> np.ndarray:
+    """
+    Share of the top factor quantile that was not in it on the previous date.
+
+    Args:
+        factor (np.ndarray): Factor values of shape (dates, tickers, factors).
+        quantiles (int): Number of quantiles.
+
+    Returns:
+        np.ndarray: Turnover of shape (dates, factors), NaN on the first date.
+    """
+    return _turnover(_by_factor(factor), quantiles)
+
+
+def ic_summary(ic: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the mean, standard deviation, information ratio, t-statistic
+    and hit rate (share of positive values) of each IC column.
+    """
+    count = ic.count()
+    mean = ic.mean()
+    std = ic.std()
+    return pd.DataFrame({
+        "mean": mean,
+        "std": std,
+        "ir": mean / std,
+        "t_stat": mean / std * np.sqrt(count),
+        "hit_rate": (ic > 0).sum() / count,
+        "count": count
+    })
+
+
+def _by_factor(values: np.ndarray) -> np.ndarray:
+    # (dates, tickers, factors) to a contiguous (dates, factors, tickers) copy
+    return np.ascontiguousarray(np.moveaxis(np.asarray(values), 1, -1), dtype=np.float64)
+
+
+def _paired(factor: np.ndarray, returns: np.ndarray):
+    # factor values (dates, factors, tickers) and returns (dates, tickers)
+    # broadcast to match, both NaN wherever either one is missing
+    forward = np.broadcast_to(returns[:, np.newaxis, :], factor.shape)
+    missing = np.isnan(factor) | np.isnan(forward)
+    return np.where(missing, np.nan, factor), np.where(missing, np.nan, forward)
+
+
+def _percentiles(*arrays: np.ndarray):
+    # percentile ranks of each (dates, factors, tickers) array, ranked in one call
+    stacked = np.concatenate(arrays, axis=1)
+    ranks = normalize_cross_section(np.moveaxis(stacked, -1, 1), "percentile")
+    return np.split(np.moveaxis(ranks, 1, -1), len(arrays), axis=1)
+
+
+def _correlation(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # Pearson correlation over the ticker (last) axis; x and y share their NaNs
+    valid = ~np.isnan(x)
+    n = np.count_nonzero(valid, axis=-1)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x -= (x.sum(axis=-1) / n)[..., np.newaxis]
+        y -= (y.sum(axis=-1) / n)[..., np.newaxis]
+        np.copyto(x, 0.0, where=~valid)
+        np.copyto(y, 0.0, where=~valid)
+        cov = np.einsum("...i,...i->...", x, y)
+        corr = cov / np.sqrt(np.einsum("...i,...i->...", x, x) * np.einsum("...i,...i->...", y, y))
+    corr[n < MIN_NAMES] = np.nan
+    return corr
+
+
+def _buckets(percentiles: np.ndarray, quantiles: int) -> np.ndarray:
+    # percentile ranks in (0, 1] to quantile numbers 0 .. quantiles - 1, -1 if missing
+    buckets = np.ceil(percentiles * quantiles)
+    np.nan_to_num(buckets, copy=False, nan=0.0)
+    buckets -= 1
+    return buckets.astype(np.int32)
+
+
+def _quantile_means(buckets: np.ndarray, forward: np.ndarray, quantiles: int) -> np.ndarray:
+    # mean forward return per quantile, shape (dates, factors, quantiles),
+    # from one weighted bincount over (date, factor, quantile) cells
+    rows = np.arange(buckets.shape[0] * buckets.shape[1]).reshape(buckets.shape[:2] + (1,))
+    cells = rows * quantiles + buckets
+    valid = buckets >= 0
+    n_cells = rows.size * quantiles
+    sums = np.bincount(cells[valid], weights=forward[valid], minlength=n_cells)
+    counts = np.bincount(cells[valid], minlength=n_cells)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (sums / counts).reshape(buckets.shape[:2] + (quantiles,))
+
+
+def _turnover(factor: np.ndarray, quantiles: int) -> np.ndarray:
+    # factor is (dates, factors, tickers)
+    (pct,) = _percentiles(factor)
+    top = _buckets(pct, quantiles) == quantiles - 1
+    kept = np.count_nonzero(top[1:] & top[:-1], axis=-1)
+    size = np.count_nonzero(top[1:], axis=-1)
+    turnover = np.full(factor.shape[:2], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        turnover[1:] = 1 - kept / size
+    return turnover
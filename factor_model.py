@@ -8,17 +8,93 @@ Factors implemented:
 - Value (Earnings Yield: 1 / PE ratio)
 
 All factors are normalized and equally weighted.
+
+Factor definitions live in `factor_registry.REGISTRY`; new factors are
+registered there and selected by name.
+
+`compute_factors` returns the scores for the last date only.
+`compute_factor_panel` computes the raw factors for every date (or a
+chosen set of dates) in one vectorized pass, so walk-forward uses slice
+the panel instead of recomputing the rolling windows per date.
 """
 
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from factor_registry import REGISTRY, FactorMemo
+from normalization import normalize_cross_section
+from pit_fundamentals import PointInTimeStore
+from universe import UniverseStore
+
+FACTOR_NAMES = ("momentum", "inverse_volatility", "earnings_yield")
+
+
+class FactorPanel(NamedTuple):
+    """
+    Raw factor values as a dates x tickers x factors array.
+    """
+    values: np.ndarray
+    dates: pd.DatetimeIndex
+    tickers: List[str]
+    factors: Tuple[str, ...] = FACTOR_NAMES
+
+    def frame(self, factor: str) -> pd.DataFrame:
+        """
+        Returns one factor as a dates x tickers DataFrame (a view, not a copy).
+        """
+        values = self.values[:, :, self.factors.index(factor)]
+        return pd.DataFrame(values, index=self.dates, columns=self.tickers, copy=False)
+
+    def cross_section(self, date) -> pd.DataFrame:
+        """
+        Returns the raw factors on `date` (as-of) as a tickers x factors DataFrame.
+        """
+        row = int(self.dates.searchsorted(pd.Timestamp(date), side="right")) - 1
+        if row < 0:
+            raise KeyError(f"No factor values on or before {date}")
+        return pd.DataFrame(self.values[row], index=self.tickers, columns=list(self.factors))
+
+    def normalize(self, method: str = "zscore", **kwargs) -> "FactorPanel":
+        """
+        Returns a panel normalized across tickers on every date, see
+        `normalization.normalize_cross_section` for the options.
+        """
+        values = normalize_cross_section(self.values, method, **kwargs)
+        return FactorPanel(values, self.dates, self.tickers, self.factors)
+
+    def scores(self, date) -> pd.DataFrame:
+        """
+        Returns normalized factor scores on `date`, as `compute_factors` would.
+        """
+        return normalize_factors(self.cross_section(date))
+
+    def top_n(self, top_n: int = 10) -> pd.DataFrame:
+        """
+        Returns the top tickers by combined score on every date at once.
+
+        Each date gets the tickers `rank_stocks(self.scores(date), top_n)`
+        selects: factors are z-scored across the tickers with no missing
+        factor and averaged with equal weights.
+
+        Returns:
+            pd.DataFrame: Dates x rank (0 = best) of ticker names, None
+            where fewer than `top_n` tickers are eligible.
+        """
+        normalized = normalize_cross_section(self.values, "zscore", complete_cases=True)
+        top = select_top_n(normalized.mean(axis=-1, dtype=np.float64), top_n)
+        names = np.array(list(self.tickers) + [None], dtype=object)
+        return pd.DataFrame(names[top], index=self.dates)
 
 
 def compute_factors(
     price_df: pd.DataFrame,
     fundamentals_df: pd.DataFrame,
-    momentum_window: int = 126  # 6 months (21 days * 6)
+    momentum_window: int = 126,  # 6 months (21 days * 6)
+    universe: Optional[UniverseStore] = None,
+    factors: Sequence[str] = FACTOR_NAMES,
+    memo: Optional[FactorMemo] = None,
+    workers: int = 1
 ) -> pd.DataFrame:
     """
     Computes momentum, volatility, and value factors for stocks.
@@ -27,26 +103,126 @@ def compute_factors(
         price_df (pd.DataFrame): Daily price data with tickers as columns.
         fundamentals_df (pd.DataFrame): Fundamental data indexed by ticker.
         momentum_window (int): Lookback window for momentum.
+        universe (UniverseStore): Optional membership; only tickers eligible
+            on the last date are scored.
+        factors (Sequence[str]): Factors to compute, any registered in
+            `factor_registry.REGISTRY`.
+        memo (FactorMemo): Optional cache of factor results across calls.
+        workers (int): Number of processes to shard the tickers across,
+            see `parallel_factors`.
 
     Returns:
         pd.DataFrame: DataFrame of normalized factor scores indexed by ticker.
     """
-    latest_prices = price_df.iloc[-1]
-    past_prices = price_df.shift(momentum_window).iloc[-1]
+    # only the last momentum_window + 1 rows feed the latest factor values,
+    # so avoid shifting or rolling (and copying) the full history
+    window_prices = price_df.iloc[-(momentum_window + 1):]
+    if workers > 1:
+        panel = compute_factor_panel(
+            window_prices, fundamentals_df, momentum_window, dates=window_prices.index[-1:],
+            factors=factors, memo=memo, workers=workers
+        )
+        factor_df = panel.cross_section(panel.dates[-1])
+    else:
+        factor_df = REGISTRY.cross_section(
+            factors, window_prices, fundamentals_df, memo=memo, window=momentum_window
+        )
+
+    if universe is not None:
+        eligible = universe.mask([price_df.index[-1]], factor_df.index).iloc[0]
+        factor_df = factor_df[eligible.to_numpy()]
+
+    return normalize_factors(factor_df)
+
+
+def compute_factor_panel(
+    price_df: pd.DataFrame,
+    fundamentals: Union[pd.DataFrame, PointInTimeStore],
+    momentum_window: int = 126,
+    dates: Optional[Sequence] = None,
+    universe: Optional[UniverseStore] = None,
+    factors: Sequence[str] = FACTOR_NAMES,
+    memo: Optional[FactorMemo] = None,
+    workers: int = 1
+) -> FactorPanel:
+    """
+    Computes raw momentum, volatility, and value factors for every date.
+
+    The values on each date match what `compute_factors` would compute on
+    the prices up to that date. Each factor and shared intermediate is
+    evaluated once over the whole panel and then gathered at the requested
+    dates, so the cost does not grow with the number of dates.
+
+    Args:
+        price_df (pd.DataFrame): Daily price data with tickers as columns.
+        fundamentals (Union[pd.DataFrame, PointInTimeStore]): Fundamentals
+            indexed by ticker (held constant over time), or a point-in-time
+            store queried as of each date.
+        momentum_window (int): Lookback window for momentum.
+        dates (Sequence): Optional dates to keep, e.g. rebalance dates;
+            each takes the prices as of the last trading day on or before it.
+            Defaults to every date in `price_df`.
+        universe (UniverseStore): Optional membership; factors of
+            non-members are NaN on each date.
+        factors (Sequence[str]): Factors to compute, any registered in
+            `factor_registry.REGISTRY`.
+        memo (FactorMemo): Optional cache of factor results across calls;
+            not supported with more than one worker.
+        workers (int): Number of processes to shard the tickers across,
+            see `parallel_factors`.
+
+    Returns:
+        FactorPanel: Raw factors, shape (dates, tickers, factors).
+    """
+    if workers > 1:
+        if memo is not None:
+            raise ValueError("A FactorMemo cannot be shared with worker processes")
+        from parallel_factors import compute_factor_panel_parallel
+        return compute_factor_panel_parallel(
+            price_df, fundamentals, momentum_window, dates, universe, factors, workers=workers
+        )
+
+    tickers = list(price_df.columns)
+    dtype = price_df.dtypes.iloc[0] if price_df.dtypes.iloc[0].kind == "f" else np.dtype("float64")
 
-    momentum = (latest_prices - past_prices) / past_prices
-    volatility = price_df.pct_change().rolling(momentum_window).std().iloc[-1]
-    inverse_volatility = 1 / volatility
+    if dates is None:
+        dates = pd.DatetimeIndex(price_df.index)
+        rows = np.arange(len(dates))
+    else:
+        dates = pd.DatetimeIndex(dates)
+        rows = price_df.index.searchsorted(dates, side="right") - 1
 
-    pe_ratio = fundamentals_df["trailingPE"]
-    earnings_yield = 1 / pe_ratio.replace(0, np.nan)
+    if isinstance(fundamentals, PointInTimeStore):
+        # fields as known on each date, so fundamentals[field] is a
+        # dates x tickers frame instead of a per-ticker Series
+        fundamentals = pd.concat(
+            {field: fundamentals.as_of(dates, field, tickers) for field in fundamentals.fields},
+            axis=1
+        )
 
-    factor_df = pd.DataFrame({
-        "momentum": momentum,
-        "inverse_volatility": inverse_volatility,
-        "earnings_yield": earnings_yield
-    })
+    results = REGISTRY.evaluate(factors, price_df, fundamentals, memo=memo, window=momentum_window)
 
+    values = np.full((len(dates), len(tickers), len(factors)), np.nan, dtype=dtype)
+    has_row = rows >= 0
+    for k, name in enumerate(factors):
+        result = results[name]
+        if isinstance(result, pd.Series):
+            values[:, :, k] = result.reindex(tickers).to_numpy(dtype="float64")[np.newaxis, :]
+        elif result.index.equals(price_df.index):
+            values[has_row, :, k] = result.reindex(columns=tickers).to_numpy()[rows[has_row]]
+        else:
+            values[:, :, k] = result.reindex(index=dates, columns=tickers).to_numpy()
+
+    if universe is not None:
+        values[~universe.mask(dates, tickers).to_numpy()] = np.nan
+
+    return FactorPanel(values, dates, tickers, tuple(factors))
+
+
+def normalize_factors(factor_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drops tickers with any missing factor and z-scores each factor column.
+    """
     factor_df = factor_df.dropna()
 
     # normalize each column
@@ -59,6 +235,9 @@ def rank_stocks(factor_scores: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     """
     Ranks stocks by combined factor scores and selects the top N.
 
+    The input is left unchanged. Tickers whose combined score is missing
+    are never selected.
+
     Args:
         factor_scores (pd.DataFrame): Normalized factor score DataFrame.
         top_n (int): Number of top-ranked stocks to return.
@@ -66,6 +245,44 @@ def rank_stocks(factor_scores: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame of top N tickers and their combined score.
     """
-    factor_scores["combined_score"] = factor_scores.mean(axis=1)
-    ranked = factor_scores.sort_values("combined_score", ascending=False)
-    return ranked.head(top_n)[["combined_score"]]
+    combined = factor_scores.mean(axis=1).to_numpy(dtype="float64")
+    top = select_top_n(combined, top_n)
+    top = top[top >= 0]
+    return pd.DataFrame({"combined_score": combined[top]}, index=factor_scores.index[top])
+
+
+def select_top_n(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Returns the positions of the `top_n` highest scores in each row.
+
+    Uses a partial selection (argpartition) per row, so the cost is linear
+    in the number of tickers plus a sort of the selected `top_n` only.
+
+    Args:
+        scores (np.ndarray): Scores of shape (dates, tickers), or (tickers,)
+            for a single date. NaN marks tickers that cannot be selected.
+        top_n (int): Number of positions to select per row.
+
+    Returns:
+        np.ndarray: Integer array of shape (dates, top_n), or (top_n,),
+        ordered from the highest score down. Rows with fewer than `top_n`
+        selectable tickers are padded with -1.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = scores.shape[-1]
+    k = min(top_n, n)
+    if k <= 0:
+        return np.full(scores.shape[:-1] + (max(top_n, 0),), -1, dtype=np.intp)
+
+    # missing scores sort below everything (-inf scores are raised to the
+    # lowest finite value to stay above them), then are masked out below
+    ranked = np.where(np.isnan(scores), -np.inf, np.maximum(scores, np.finfo(np.float64).min))
+    top = np.argpartition(ranked, n - k, axis=-1)[..., n - k:]
+    order = np.argsort(-np.take_along_axis(ranked, top, axis=-1), axis=-1, kind="stable")
+    top = np.take_along_axis(top, order, axis=-1)
+    top[np.isnan(np.take_along_axis(scores, top, axis=-1))] = -1
+
+    if k < top_n:
+        padding = np.full(scores.shape[:-1] + (top_n - k,), -1, dtype=top.dtype)
+        top = np.concatenate([top, padding], axis=-1)
+    return top
@@ -0,0 +1,177 @@
+"""
+This module provides a cache for slowly changing fundamental data.
+
+Features:
+- Per-field time-to-live (e.g. market cap expires sooner than P/B)
+- LRU eviction bounded by entry count and/or approximate size in bytes
+- Optional JSON backing file so cached values survive across processes
+- Hit/miss counters for monitoring the hit rate
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+DAY = 24 * 60 * 60
+
+# time-to-live in seconds per fundamental field
+DEFAULT_TTLS = {
+    "marketCap": 1 * DAY,
+    "trailingPE": 1 * DAY,
+    "priceToBook": 7 * DAY,
+    "dividendYield": 7 * DAY,
+}
+
+
+class FundamentalsCache:
+    """
+    LRU cache of per-ticker fundamental records with per-field expiry.
+
+    A lookup is a hit only if every requested field is present and
+    younger than its TTL; otherwise the ticker has to be refetched.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 1 * DAY,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            path (str): Optional JSON file backing the cache.
+            ttls (Dict[str, float]): Time-to-live in seconds per field.
+            default_ttl (float): TTL for fields not listed in `ttls`.
+            max_entries (int): Maximum number of cached tickers.
+            max_bytes (int): Maximum approximate serialized size of all entries.
+            clock (Callable[[], float]): Time source, in seconds since the epoch.
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+
+        # ticker -> {field: [value, fetched_at]}, least recently used first
+        self._entries: "OrderedDict[str, Dict[str, list]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def get(self, ticker: str, fields: list) -> Optional[dict]:
+        """
+        Returns the cached record for a ticker if all fields are fresh.
+
+        Args:
+            ticker (str): Stock ticker.
+            fields (list): Fields that must be present and unexpired.
+
+        Returns:
+            dict: {field: value}, or None on a miss.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None or not all(self._is_fresh(entry, field, now) for field in fields):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(ticker)
+            self.hits += 1
+            return {field: entry[field][0] for field in fields}
+
+    def put(self, ticker: str, record: dict) -> None:
+        """
+        Stores freshly fetched values for a ticker.
+
+        Args:
+            ticker (str): Stock ticker.
+            record (dict): {field: value} as fetched from the provider.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.pop(ticker, {})
+            self._total_bytes -= self._sizes.pop(ticker, 0)
+            for field, value in record.items():
+                entry[field] = [value, now]
+            self._insert(ticker, entry)
+            self._evict()
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters, hit rate and current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def save(self) -> None:
+        """
+        Writes all entries to the backing file, preserving LRU order.
+        """
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            payload = {"entries": list(self._entries.items())}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        """
+        Replaces in-memory entries with the contents of the backing file.
+        """
+        with open(self.path) as f:
+            payload = json.load(f)
+
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+            for ticker, entry in payload.get("entries", []):
+                self._insert(ticker, entry)
+            self._evict()
+
+    def _is_fresh(self, entry: Dict[str, list], field: str, now: float) -> bool:
+        if field not in entry:
+            return False
+        fetched_at = entry[field][1]
+        return now - fetched_at < self.ttls.get(field, self.default_ttl)
+
+    def _insert(self, ticker: str, entry: Dict[str, list]) -> None:
+        size = len(json.dumps(entry)) + len(ticker)
+        self._entries[ticker] = entry
+        self._sizes[ticker] = size
+        self._total_bytes += size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            ticker, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(ticker)
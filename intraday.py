@@ -0,0 +1,189 @@
+"""
+This module handles intraday (minute/hourly) OHLCV bar panels:
+- Chunked ingestion of long-format bar files (CSV or Parquet)
+- Vectorized OHLCV resampling to any fixed bar size
+- Compact memory-mapped storage (one PanelStore per field)
+
+Bar panels hold one dates x tickers frame per field. The `close` frame
+can be passed directly to `compute_factors` (windows are then measured
+in bars) and `run_backtest`.
+
+Input files are long format with columns:
+    timestamp, ticker, open, high, low, close, volume
+"""
+
+import os
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from panel_store import PanelStore
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarPanel(NamedTuple):
+    open: pd.DataFrame
+    high: pd.DataFrame
+    low: pd.DataFrame
+    close: pd.DataFrame
+    volume: pd.DataFrame
+
+
+def load_intraday_bars(
+    paths: Union[str, List[str]],
+    tickers: Optional[List[str]] = None,
+    chunksize: int = 1_000_000,
+    dtype: str = "float32",
+    volume_dtype: str = "float64"
+) -> BarPanel:
+    """
+    Reads long-format bar files in chunks into a wide OHLCV panel.
+
+    Each chunk is reduced to compact arrays (int64 timestamps, integer
+    ticker codes, `dtype` values) before the next one is read, so the
+    raw text/table data is never held in memory all at once. Volume keeps
+    its own dtype: float32 would round volumes above 2**24 shares.
+
+    Args:
+        paths (Union[str, List[str]]): Files, or a directory of .csv/.parquet files.
+        tickers (List[str]): Optional tickers to keep, defaults to all found.
+        chunksize (int): Rows per chunk.
+        dtype (str): dtype of the open, high, low and close panels.
+        volume_dtype (str): dtype of the volume panel.
+
+    Returns:
+        BarPanel: Panels with timestamps as index and tickers as columns.
+    """
+    keep = None if tickers is None else set(tickers)
+    codes_by_ticker = {} if tickers is None else {t: i for i, t in enumerate(tickers)}
+
+    stamps, codes = [], []
+    values = {field: [] for field in OHLCV_FIELDS}
+    dtypes = {field: volume_dtype if field == "volume" else dtype for field in OHLCV_FIELDS}
+    for chunk in _iter_chunks(_resolve_paths(paths), chunksize):
+        if keep is not None:
+            chunk = chunk[chunk["ticker"].isin(keep)]
+        if chunk.empty:
+            continue
+
+        for ticker in chunk["ticker"].unique():
+            codes_by_ticker.setdefault(ticker, len(codes_by_ticker))
+        codes.append(chunk["ticker"].map(codes_by_ticker).to_numpy(dtype=np.int32))
+        stamps.append(pd.DatetimeIndex(pd.to_datetime(chunk["timestamp"])).tz_localize(None).as_unit("ns").asi8)
+        for field in OHLCV_FIELDS:
+            values[field].append(chunk[field].to_numpy(dtype=dtypes[field]))
+
+    ticker_names = sorted(codes_by_ticker, key=codes_by_ticker.get)
+    if not stamps:
+        index = pd.DatetimeIndex([], name="Date")
+        return BarPanel(*(
+            pd.DataFrame(columns=ticker_names, index=index, dtype=dtypes[field]) for field in OHLCV_FIELDS
+        ))
+
+    stamps = np.concatenate(stamps)
+    codes = np.concatenate(codes)
+    times = np.unique(stamps)
+    rows = np.searchsorted(times, stamps)
+    index = pd.DatetimeIndex(times.astype("datetime64[ns]"), name="Date")
+
+    panels = []
+    for field in OHLCV_FIELDS:
+        wide = np.full((len(times), len(ticker_names)), np.nan, dtype=dtypes[field])
+        wide[rows, codes] = np.concatenate(values[field])
+        values[field] = None  # release the long arrays as we go
+        panels.append(pd.DataFrame(wide, index=index, columns=ticker_names, copy=False))
+    return BarPanel(*panels)
+
+
+def resample_ohlcv(bars: BarPanel, rule: str) -> BarPanel:
+    """
+    Aggregates bars to a coarser fixed bar size, e.g. '5min', '1h' or '1D'.
+
+    Open is the first valid open, high the max, low the min, close the
+    last valid close and volume the sum within each bar. Bars with no
+    valid close are dropped. All tickers are aggregated together with
+    `ufunc.reduceat` over the bin boundaries; there is no per-ticker loop.
+
+    Args:
+        bars (BarPanel): Input panels with a sorted DatetimeIndex.
+        rule (str): Target bar size; any fixed frequency accepted by `DatetimeIndex.floor`.
+
+    Returns:
+        BarPanel: Resampled panels labelled by bar start time.
+    """
+    index = pd.DatetimeIndex(bars.close.index)
+    if len(index) == 0:
+        return bars
+
+    bins = index.floor(rule)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    out_index = pd.DatetimeIndex(bins[starts], name=index.name)
+
+    close = bars.close.to_numpy()
+    valid = ~np.isnan(close)
+    n_rows = len(index)
+    row = np.arange(n_rows)[:, np.newaxis]
+    cols = np.arange(close.shape[1])[np.newaxis, :]
+
+    last_row = np.maximum.reduceat(np.where(valid, row, -1), starts, axis=0)
+    has_data = last_row >= 0
+
+    open_values = bars.open.to_numpy()
+    first_row = np.minimum.reduceat(np.where(~np.isnan(open_values), row, n_rows), starts, axis=0)
+
+    with np.errstate(invalid="ignore"):
+        resampled = {
+            "open": np.where(first_row < n_rows, open_values[np.minimum(first_row, n_rows - 1), cols], np.nan),
+            "high": np.fmax.reduceat(bars.high.to_numpy(), starts, axis=0),
+            "low": np.fmin.reduceat(bars.low.to_numpy(), starts, axis=0),
+            "close": close[np.maximum(last_row, 0), cols],
+            "volume": np.add.reduceat(np.nan_to_num(bars.volume.to_numpy(), nan=0.0).astype(np.float64), starts, axis=0),
+        }
+
+    keep = has_data.any(axis=1)
+    panels = []
+    for field in OHLCV_FIELDS:
+        source = getattr(bars, field)
+        data = np.where(has_data, resampled[field], np.nan)[keep].astype(source.dtypes.iloc[0], copy=False)
+        panels.append(pd.DataFrame(data, index=out_index[keep], columns=source.columns, copy=False))
+    return BarPanel(*panels)
+
+
+def save_bars(path: str, bars: BarPanel) -> None:
+    """
+    Stores each field as a memory-mapped PanelStore under `path/<field>`.
+    """
+    for field in OHLCV_FIELDS:
+        panel = getattr(bars, field)
+        PanelStore.write(os.path.join(path, field), panel, dtype=panel.dtypes.iloc[0])
+
+
+def open_bars(path: str) -> BarPanel:
+    """
+    Opens bars written by `save_bars` as memory-mapped, zero-copy frames.
+    """
+    return BarPanel(*(PanelStore(os.path.join(path, field)).frame() for field in OHLCV_FIELDS))
+
+
+def _resolve_paths(paths: Union[str, List[str]]) -> List[str]:
+    if isinstance(paths, str):
+        if os.path.isdir(paths):
+            return sorted(
+                os.path.join(paths, name) for name in os.listdir(paths)
+                if name.endswith((".csv", ".parquet"))
+            )
+        return [paths]
+    return list(paths)
+
+
+def _iter_chunks(paths: List[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    for path in paths:
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize)
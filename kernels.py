@@ -0,0 +1,365 @@
+"""
+This module provides NaN-aware rolling kernels on 2D float arrays.
+
+Each kernel takes a (dates, tickers) array and works down the date
+axis for all tickers at once, without going through pandas' rolling
+machinery:
+- rolling_sum, rolling_mean, rolling_std
+- rolling_min, rolling_max
+- ewma (exponentially weighted mean)
+- rolling_beta (against a market series or a matching panel)
+
+Missing values are skipped, and a window yields NaN when it holds fewer
+than `min_periods` valid values (default: the full window), as in
+`DataFrame.rolling`.
+
+When numba is installed, compiled per-ticker loops are used (sliding
+Welford moments, monotonic deques for min/max), parallelized across
+tickers. Otherwise the kernels fall back to vectorized NumPy:
+differences of cumulative sums for the moments, the van Herk/Gil-Werman
+block scan for min/max, and a date loop vectorized across tickers for
+the EWMA. Set `USE_NUMBA = False` to force the fallback.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+try:
+    import numba
+
+    HAVE_NUMBA = True
+except ImportError:
+    numba = None
+    HAVE_NUMBA = False
+
+USE_NUMBA = HAVE_NUMBA
+
+
+def rolling_sum(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Rolling sum of the valid values in each window.
+    """
+    x, min_periods = _prepare(x, window, min_periods)
+    if USE_NUMBA:
+        return _nb_rolling_moments(x, window, min_periods, 0, 0)
+    counts, sums = _window_sums(x, window)
+    return np.where(counts >= min_periods, sums, np.nan)
+
+
+def rolling_mean(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Rolling mean of the valid values in each window.
+    """
+    x, min_periods = _prepare(x, window, min_periods)
+    if USE_NUMBA:
+        return _nb_rolling_moments(x, window, min_periods, 1, 0)
+    counts, sums = _window_sums(x, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts >= min_periods, sums / counts, np.nan)
+
+
+def rolling_std(
+    x: np.ndarray,
+    window: int,
+    min_periods: Optional[int] = None,
+    ddof: int = 1
+) -> np.ndarray:
+    """
+    Rolling standard deviation of the valid values in each window.
+
+    The NumPy fallback subtracts each column's mean before accumulating,
+    so the cumulative sums stay small relative to the window variance.
+    """
+    x, min_periods = _prepare(x, window, min_periods)
+    if USE_NUMBA:
+        return _nb_rolling_moments(x, window, min_periods, 2, ddof)
+
+    centered = x - _column_mean(x)
+    counts, sums = _window_sums(centered, window)
+    _, squares = _window_sums(centered * centered, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - sums * sums / counts) / (counts - ddof)
+    enough = (counts >= min_periods) & (counts > ddof)
+    return np.where(enough, np.sqrt(np.maximum(variance, 0)), np.nan)
+
+
+def rolling_min(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Rolling minimum of the valid values in each window.
+    """
+    return _rolling_extreme(x, window, min_periods, np.fmin, is_max=False)
+
+
+def rolling_max(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Rolling maximum of the valid values in each window.
+    """
+    return _rolling_extreme(x, window, min_periods, np.fmax, is_max=True)
+
+
+def ewma(x: np.ndarray, span: Optional[float] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    Exponentially weighted mean, as `DataFrame.ewm(span=...).mean()`.
+
+    Missing values get no weight but the decay still advances over them,
+    and the output on a missing date carries the previous mean.
+
+    Args:
+        x (np.ndarray): Values of shape (dates, tickers).
+        span (float): Decay in terms of span, alpha = 2 / (span + 1).
+        alpha (float): Smoothing factor, used if `span` is not given.
+
+    Returns:
+        np.ndarray: EWMA of the same shape as `x`.
+    """
+    if span is not None:
+        alpha = 2 / (span + 1)
+    if alpha is None or not 0 < alpha <= 1:
+        raise ValueError("ewma needs a span >= 1 or an alpha in (0, 1]")
+    x, _ = _prepare(x, 1, None)
+    if USE_NUMBA:
+        return _nb_ewma(x, 1 - alpha)
+
+    decay = 1 - alpha
+    numerator = np.zeros(x.shape[1])
+    denominator = np.zeros(x.shape[1])
+    out = np.empty_like(x)
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for t in range(len(x)):
+            numerator *= decay
+            denominator *= decay
+            numerator += filled[t]
+            denominator += valid[t]
+            np.divide(numerator, denominator, out=out[t])
+    return out
+
+
+def rolling_beta(
+    y: np.ndarray,
+    x: np.ndarray,
+    window: int,
+    min_periods: Optional[int] = None
+) -> np.ndarray:
+    """
+    Rolling OLS beta of each column of `y` on `x`.
+
+    Only dates where both are valid are used, for the covariance and the
+    variance alike.
+
+    Args:
+        y (np.ndarray): Returns of shape (dates, tickers).
+        x (np.ndarray): Market returns of shape (dates,), or (dates, tickers)
+            for a separate regressor per ticker.
+        window (int): Rolling window length.
+        min_periods (int): Minimum paired observations, defaults to `window`.
+
+    Returns:
+        np.ndarray: Betas of the same shape as `y`.
+    """
+    y, min_periods = _prepare(y, window, min_periods)
+    x = np.asarray(x, dtype=np.float64)
+    x = np.broadcast_to(x[:, np.newaxis] if x.ndim == 1 else x, y.shape)
+    if USE_NUMBA:
+        return _nb_rolling_beta(y, np.ascontiguousarray(x), window, min_periods)
+
+    paired = ~(np.isnan(x) | np.isnan(y))
+    xc = np.where(paired, x, np.nan)
+    yc = np.where(paired, y, np.nan)
+    xc -= _column_mean(xc)
+    yc -= _column_mean(yc)
+
+    counts, sx = _window_sums(xc, window)
+    _, sy = _window_sums(yc, window)
+    _, sxy = _window_sums(xc * yc, window)
+    _, sxx = _window_sums(xc * xc, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = sxy - sx * sy / counts
+        variance = sxx - sx * sx / counts
+        beta = covariance / variance
+    return np.where((counts >= min_periods) & (counts > 1), beta, np.nan)
+
+
+def _prepare(x: np.ndarray, window: int, min_periods: Optional[int]):
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim != 2:
+        raise ValueError(f"expected a (dates, tickers) array, got shape {x.shape}")
+    min_periods = window if min_periods is None else max(int(min_periods), 1)
+    return np.ascontiguousarray(x), min_periods
+
+
+def _column_mean(x: np.ndarray) -> np.ndarray:
+    # mean of the valid values per column (0 for empty columns), used to
+    # center the data before taking cumulative sums
+    valid = ~np.isnan(x)
+    return np.where(valid, x, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+
+
+def _window_sums(x: np.ndarray, window: int):
+    """
+    Returns (valid counts, sums of valid values) over each trailing window.
+    """
+    valid = ~np.isnan(x)
+    counts = np.cumsum(valid, axis=0, dtype=np.int64)
+    sums = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    counts[window:] = counts[window:] - counts[:-window]
+    sums[window:] = sums[window:] - sums[:-window]
+    return counts, sums
+
+
+def _rolling_extreme(x, window, min_periods, reduce, is_max):
+    x, min_periods = _prepare(x, window, min_periods)
+    if USE_NUMBA:
+        return _nb_rolling_extreme(x, window, min_periods, is_max)
+
+    # van Herk/Gil-Werman: split the dates into blocks of `window` rows;
+    # each window spans the tail of one block and the head of the next
+    n_dates, n_tickers = x.shape
+    pad = (-n_dates) % window
+    blocks = np.concatenate([x, np.full((pad, n_tickers), np.nan)]).reshape(-1, window, n_tickers)
+    prefix = reduce.accumulate(blocks, axis=1).reshape(-1, n_tickers)[:n_dates]
+    suffix = np.flip(reduce.accumulate(np.flip(blocks, 1), axis=1), 1).reshape(-1, n_tickers)[:n_dates]
+
+    out = prefix.copy()
+    out[window - 1:] = reduce(suffix[:n_dates - window + 1], prefix[window - 1:])
+    counts, _ = _window_sums(x, window)
+    return np.where(counts >= min_periods, out, np.nan)
+
+
+# compiled kernels: one pass per ticker, tickers in parallel; the loop
+# bodies below are only used when numba is available
+
+def _nb_rolling_moments_impl(x, window, min_periods, moment, ddof):
+    # moment: 0 = sum, 1 = mean, 2 = std (sliding Welford)
+    n_dates, n_tickers = x.shape
+    out = np.empty_like(x)
+    for j in _prange(n_tickers):
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        total = 0.0
+        for t in range(n_dates):
+            value = x[t, j]
+            if value == value:
+                count += 1
+                total += value
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+            if t >= window:
+                old = x[t - window, j]
+                if old == old:
+                    count -= 1
+                    total -= old
+                    if count == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        new_mean = mean - (old - mean) / count
+                        m2 -= (old - mean) * (old - new_mean)
+                        mean = new_mean
+            if count < min_periods or (moment == 2 and count <= ddof):
+                out[t, j] = np.nan
+            elif moment == 0:
+                out[t, j] = total
+            elif moment == 1:
+                out[t, j] = mean
+            else:
+                out[t, j] = np.sqrt(max(m2, 0.0) / (count - ddof))
+    return out
+
+
+def _nb_rolling_extreme_impl(x, window, min_periods, is_max):
+    # monotonic deque of row indices per ticker
+    n_dates, n_tickers = x.shape
+    out = np.empty_like(x)
+    for j in _prange(n_tickers):
+        queue = np.empty(n_dates, dtype=np.int64)
+        head = 0
+        tail = 0
+        count = 0
+        for t in range(n_dates):
+            value = x[t, j]
+            if value == value:
+                count += 1
+                while tail > head and ((x[queue[tail - 1], j] <= value) if is_max else (x[queue[tail - 1], j] >= value)):
+                    tail -= 1
+                queue[tail] = t
+                tail += 1
+            if t >= window:
+                if x[t - window, j] == x[t - window, j]:
+                    count -= 1
+                if tail > head and queue[head] <= t - window:
+                    head += 1
+            out[t, j] = x[queue[head], j] if count >= min_periods and tail > head else np.nan
+    return out
+
+
+def _nb_ewma_impl(x, decay):
+    n_dates, n_tickers = x.shape
+    out = np.empty_like(x)
+    for j in _prange(n_tickers):
+        numerator = 0.0
+        denominator = 0.0
+        for t in range(n_dates):
+            numerator *= decay
+            denominator *= decay
+            value = x[t, j]
+            if value == value:
+                numerator += value
+                denominator += 1.0
+            out[t, j] = numerator / denominator if denominator > 0 else np.nan
+    return out
+
+
+def _nb_rolling_beta_impl(y, x, window, min_periods):
+    n_dates, n_tickers = y.shape
+    out = np.empty_like(y)
+    for j in _prange(n_tickers):
+        count = 0
+        mean_x = 0.0
+        mean_y = 0.0
+        cxy = 0.0
+        cxx = 0.0
+        for t in range(n_dates):
+            xv = x[t, j]
+            yv = y[t, j]
+            if xv == xv and yv == yv:
+                count += 1
+                dx = xv - mean_x
+                mean_x += dx / count
+                mean_y += (yv - mean_y) / count
+                cxy += dx * (yv - mean_y)
+                cxx += dx * (xv - mean_x)
+            if t >= window:
+                xo = x[t - window, j]
+                yo = y[t - window, j]
+                if xo == xo and yo == yo:
+                    count -= 1
+                    if count == 0:
+                        mean_x = mean_y = cxy = cxx = 0.0
+                    else:
+                        dx = xo - mean_x
+                        mean_x -= dx / count
+                        mean_y -= (yo - mean_y) / count
+                        cxy -= dx * (yo - mean_y)
+                        cxx -= dx * (xo - mean_x)
+            out[t, j] = cxy / cxx if count >= min_periods and count > 1 and cxx > 0 else np.nan
+    return out
+
+
+if HAVE_NUMBA:
+    _prange = numba.prange
+    _jit = numba.njit(parallel=True, cache=True)
+    _nb_rolling_moments = _jit(_nb_rolling_moments_impl)
+    _nb_rolling_extreme = _jit(_nb_rolling_extreme_impl)
+    _nb_ewma = _jit(_nb_ewma_impl)
+    _nb_rolling_beta = _jit(_nb_rolling_beta_impl)
+else:
+    _prange = range
@@ -0,0 +1,222 @@
+"""
+This module provides a lazy handle over a price panel.
+
+A `LazyPricePanel` records which tickers and which dates a pipeline
+stage needs, and reads nothing until `collect()` is called. The ticker
+and date projections are pushed down to the source, so each stage only
+materializes its own slice instead of the whole history.
+
+A source is any object with
+    read(tickers, start, end) -> pd.DataFrame
+and optionally
+    read_last(tickers, n, start, end) -> pd.DataFrame
+for an exact "last n rows" read. `PriceCache`, `PanelStore` and
+`FetchSource` all qualify.
+"""
+
+import math
+import threading
+from typing import List, Optional
+
+import pandas as pd
+
+from data_fetcher import fetch_price_data, open_price_cache
+from price_cache import PriceCache
+
+
+class LazyPricePanel:
+    """
+    Deferred, projectable view of a close-price panel.
+
+    Handles are immutable: `select`, `between` and `tail` return new
+    handles that narrow the projection.
+    """
+
+    def __init__(
+        self,
+        source,
+        tickers: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        last_n: Optional[int] = None
+    ):
+        """
+        Args:
+            source: Object providing `read(tickers, start, end)`.
+            tickers (List[str]): Tickers in the projection.
+            start (str): Optional start date in 'YYYY-MM-DD'.
+            end (str): Optional end date in 'YYYY-MM-DD' (exclusive).
+            last_n (int): Optional number of trailing rows to keep.
+        """
+        self.source = source
+        self.tickers = list(tickers)
+        self.start = start
+        self.end = end
+        self.last_n = last_n
+
+    def select(self, tickers: List[str]) -> "LazyPricePanel":
+        """
+        Narrows the projection to a subset of tickers.
+        """
+        return LazyPricePanel(self.source, list(tickers), self.start, self.end, self.last_n)
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> "LazyPricePanel":
+        """
+        Narrows the date range to [start, end) within the current range.
+        """
+        start = _later(self.start, start)
+        end = _earlier(self.end, end)
+        return LazyPricePanel(self.source, self.tickers, start, end, self.last_n)
+
+    def tail(self, n: int) -> "LazyPricePanel":
+        """
+        Keeps only the last `n` rows of the current date range.
+        """
+        last_n = n if self.last_n is None else min(n, self.last_n)
+        return LazyPricePanel(self.source, self.tickers, self.start, self.end, last_n)
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Reads and returns the projected slice.
+
+        Returns:
+            pd.DataFrame: Prices with date as index and the selected tickers as columns.
+        """
+        if self.last_n is None:
+            return self.source.read(self.tickers, self.start, self.end)
+
+        if hasattr(self.source, "read_last"):
+            return self.source.read_last(self.tickers, self.last_n, self.start, self.end)
+
+        # estimate a calendar window that holds last_n trading days, and fall
+        # back to the full range if holidays or gaps make it too short
+        end = pd.Timestamp(self.end) if self.end is not None else pd.Timestamp.today().normalize()
+        window_start = end - pd.Timedelta(days=math.ceil(self.last_n * 1.6) + 10)
+        start = _later(self.start, window_start.strftime("%Y-%m-%d"))
+
+        df = self.source.read(self.tickers, start, self.end).dropna(how="all")
+        if len(df) < self.last_n and start != self.start:
+            df = self.source.read(self.tickers, self.start, self.end).dropna(how="all")
+        return df.iloc[-self.last_n:] if self.last_n > 0 else df.iloc[:0]
+
+    def __repr__(self) -> str:
+        return (f"LazyPricePanel({len(self.tickers)} tickers, start={self.start}, "
+                f"end={self.end}, last_n={self.last_n})")
+
+
+class FetchSource:
+    """
+    Source that reads through `data_fetcher.fetch_price_data`.
+
+    With a cache directory, each read only touches the requested tickers
+    and dates in the cache and downloads whatever is missing.
+
+    Given a range (tickers, start, end) and a cache directory, the first
+    read inside the range fills the cache coverage for the whole range in
+    one batched download, without building a panel. Every read inside
+    the range is then a projection pushed down to the cache: only the
+    requested tickers' segments are read, and `read_last` reads only the
+    newest segments. Without a cache directory there is nowhere to keep
+    the download, so the range is fetched once and held in memory.
+    """
+
+    def __init__(
+        self,
+        tickers: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        **fetch_kwargs
+    ):
+        """
+        Args:
+            tickers (List[str]): Optional tickers of the range fetched once.
+            start (str): Start date in 'YYYY-MM-DD' of that range.
+            end (str): End date in 'YYYY-MM-DD' (exclusive) of that range.
+            **fetch_kwargs: Keyword arguments for `fetch_price_data`
+                (cache_dir, provider, refresh, chunk_size, max_workers, dtype,
+                cache_format).
+        """
+        self.tickers = None if tickers is None else list(tickers)
+        self.start = start
+        self.end = end
+        self.fetch_kwargs = fetch_kwargs
+        self._lock = threading.Lock()
+        self._cache: Optional[PriceCache] = None
+        self._panel: Optional[pd.DataFrame] = None
+
+    def read(self, tickers: List[str], start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+        if not self._covers(tickers, start, end):
+            if start is None or end is None:
+                raise ValueError("FetchSource needs an explicit start and end date")
+            return fetch_price_data(tickers, start, end, **self.fetch_kwargs)
+
+        start, end = start or self.start, end or self.end
+        cache = self._filled_cache()
+        if cache is not None:
+            return self._finish(cache.read(list(tickers), start, end))
+
+        dates = self._panel.index
+        rows = (dates >= pd.Timestamp(start)) & (dates < pd.Timestamp(end))
+        return self._panel.loc[rows, list(tickers)]
+
+    def read_last(
+        self,
+        tickers: List[str],
+        n: int,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Returns the last `n` rows within [start, end); inside the range and
+        with a cache, only the trailing segments are read.
+        """
+        if self._covers(tickers, start, end) and self._filled_cache() is not None:
+            start, end = start or self.start, end or self.end
+            return self._finish(self._cache.read_last(list(tickers), n, start, end))
+
+        df = self.read(tickers, start, end).dropna(how="all")
+        return df.iloc[-n:] if n > 0 else df.iloc[:0]
+
+    def _filled_cache(self) -> Optional[PriceCache]:
+        # fills the range once; returns None when there is no cache
+        with self._lock:
+            if self._cache is None and self._panel is None:
+                cache_dir = self.fetch_kwargs.get("cache_dir")
+                if cache_dir is None:
+                    self._panel = fetch_price_data(self.tickers, self.start, self.end, **self.fetch_kwargs)
+                else:
+                    cache = open_price_cache(
+                        cache_dir,
+                        **{k: v for k, v in self.fetch_kwargs.items()
+                           if k in ("provider", "chunk_size", "max_workers", "cache_format")}
+                    )
+                    cache.fill(self.tickers, self.start, self.end, refresh=self.fetch_kwargs.get("refresh", False))
+                    self._cache = cache
+        return self._cache
+
+    def _finish(self, df: pd.DataFrame) -> pd.DataFrame:
+        # the same post-processing as fetch_price_data
+        return df.dropna(how="all").astype(self.fetch_kwargs.get("dtype", "float64"))
+
+    def _covers(self, tickers: List[str], start: Optional[str], end: Optional[str]) -> bool:
+        if self.tickers is None or self.start is None or self.end is None:
+            return False
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        return (
+            pd.Timestamp(start) >= pd.Timestamp(self.start)
+            and pd.Timestamp(end) <= pd.Timestamp(self.end)
+            and set(tickers) <= set(self.tickers)
+        )
+
+
+def _later(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None or b is None:
+        return a if b is None else b
+    return max(a, b, key=pd.Timestamp)
+
+
+def _earlier(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None or b is None:
+        return a if b is None else b
+    return min(a, b, key=pd.Timestamp)
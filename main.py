@@ -10,7 +10,16 @@ Workflow:
 6. Visualize results (equity curve, drawdown, Sharpe ratio)
 """
 
-from data_fetcher import fetch_price_data, fetch_fundamentals
+import pandas as pd
+
+from data_fetcher import fetch_fundamentals
+from data_quality import validate_prices
+from fundamentals_cache import FundamentalsCache
+from lazy_panel import FetchSource, LazyPricePanel
+from pit_fundamentals import PointInTimeStore
+from providers import make_provider
+from replay import RecordingProvider
+from universe import UniverseStore
 from factor_model import compute_factors, rank_stocks
 from optimizer import optimize_portfolio
 from backtest import run_backtest
@@ -19,15 +28,62 @@ import config
 
 
 def main():
+    universe = None
+    tickers = config.TICKERS
+    if config.UNIVERSE_PATH is not None:
+        universe = UniverseStore.load(config.UNIVERSE_PATH)
+        tickers = universe.tickers
+
     print("Fetching price and fundamental data...")
-    price_df = fetch_price_data(config.TICKERS, config.START_DATE, config.END_DATE)
-    fundamentals_df = fetch_fundamentals(config.TICKERS)
+    provider = make_provider(config.DATA_PROVIDER, data_dir=config.DATA_DIR)
+    if config.RECORD_FIXTURES_DIR is not None:
+        provider = RecordingProvider(provider, config.RECORD_FIXTURES_DIR)
+    # prices are loaded lazily: the first read fills the cache for the
+    # configured range, and each stage below reads only its own slice
+    prices = LazyPricePanel(
+        FetchSource(
+            tickers,
+            config.START_DATE,
+            config.END_DATE,
+            cache_dir=config.PRICE_CACHE_DIR,
+            refresh=config.PRICE_CACHE_REFRESH,
+            cache_format=config.PRICE_CACHE_FORMAT,
+            provider=provider,
+            chunk_size=config.PRICE_CHUNK_SIZE,
+            max_workers=config.PRICE_MAX_WORKERS,
+            dtype=config.PRICE_DTYPE
+        ),
+        tickers,
+        config.START_DATE,
+        config.END_DATE
+    )
+    fundamentals_cache = None
+    if config.FUNDAMENTALS_CACHE_PATH is not None:
+        fundamentals_cache = FundamentalsCache(config.FUNDAMENTALS_CACHE_PATH)
+    fundamentals_df = fetch_fundamentals(
+        tickers,
+        max_workers=config.FUNDAMENTALS_MAX_WORKERS,
+        requests_per_second=config.FUNDAMENTALS_RATE_LIMIT,
+        max_retries=config.FUNDAMENTALS_MAX_RETRIES,
+        cache=fundamentals_cache,
+        provider=provider
+    )
+
+    # keep a point-in-time history of snapshots for look-ahead-free backtests;
+    # only tickers whose values changed since the last run add rows
+    if config.FUNDAMENTALS_PIT_PATH is not None:
+        pit_store = PointInTimeStore(config.FUNDAMENTALS_PIT_PATH)
+        pit_store.record(fundamentals_df, pd.Timestamp.now(), only_changed=True)
+        pit_store.save()
 
     print("Calculating factor scores...")
+    # the latest factor values only need the momentum lookback window
+    factor_prices = load_prices(prices.tail(config.MOMENTUM_LOOKBACK_DAYS + 1))
     factor_scores = compute_factors(
-        price_df,
+        factor_prices,
         fundamentals_df,
-        momentum_window=config.MOMENTUM_LOOKBACK_DAYS
+        momentum_window=config.MOMENTUM_LOOKBACK_DAYS,
+        universe=universe
     )
 
     print("Ranking stocks and selecting top performers...")
@@ -43,14 +99,32 @@ def main():
 
     print("Running backtest...")
     results = run_backtest(
-        price_df,
+        load_prices(prices.select(list(weights))),
         weights,
-        rebalance_freq=config.REBALANCE_FREQUENCY
+        rebalance_freq=config.REBALANCE_FREQUENCY,
+        universe=universe
     )
 
     print("Visualizing performance...")
     plot_results(results)
 
 
+def load_prices(panel: LazyPricePanel) -> pd.DataFrame:
+    """
+    Materializes a price slice and runs the data-quality checks on it.
+    """
+    price_df = panel.collect()
+    if config.VALIDATE_PRICES:
+        price_df, exceptions = validate_prices(
+            price_df,
+            stale_days=config.STALE_PRICE_DAYS,
+            outlier_zscore=config.OUTLIER_ZSCORE,
+            adjust_splits=config.ADJUST_SPLITS
+        )
+        if len(exceptions):
+            print(f"Data-quality exceptions: {exceptions['issue'].value_counts().to_dict()}")
+    return price_df
+
+
 if __name__ == "__main__":
     main()
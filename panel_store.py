@@ -0,0 +1,189 @@
+"""
+This module provides a memory-mapped, array-backed store for large
+price panels (dates x tickers).
+
+The panel is kept on disk as a column-major `.npy` matrix, so each
+ticker's history is contiguous and opening the store only maps the file.
+Pages are read lazily as columns are touched, keeping resident memory
+proportional to the data actually used.
+
+Layout:
+    <path>/values.npy     float matrix, shape (dates, tickers), Fortran order
+    <path>/dates.npy      int64 nanoseconds since the epoch
+    <path>/meta.json      tickers and dtype
+"""
+
+import json
+import os
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+VALUES_FILE = "values.npy"
+DATES_FILE = "dates.npy"
+META_FILE = "meta.json"
+
+
+class PanelStore:
+    """
+    Read-only memory-mapped view over a stored price panel.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Directory created by `PanelStore.write`.
+        """
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+
+        self.tickers: List[str] = meta["tickers"]
+        self.dates = pd.DatetimeIndex(np.load(os.path.join(path, DATES_FILE)).astype("datetime64[ns]"))
+        self.values = np.load(os.path.join(path, VALUES_FILE), mmap_mode="r")
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        price_df: pd.DataFrame,
+        dtype: Union[str, np.dtype] = "float64"
+    ) -> "PanelStore":
+        """
+        Writes a price panel to disk and returns it opened as a store.
+
+        Args:
+            path (str): Target directory.
+            price_df (pd.DataFrame): Prices with dates as index and tickers as columns.
+            dtype (str): Storage dtype of the values.
+
+        Returns:
+            PanelStore: The newly written store.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        values = np.lib.format.open_memmap(
+            os.path.join(path, VALUES_FILE),
+            mode="w+",
+            dtype=dtype,
+            shape=price_df.shape,
+            fortran_order=True
+        )
+        # copy column by column to avoid materializing a second full panel
+        for j, ticker in enumerate(price_df.columns):
+            values[:, j] = price_df[ticker].to_numpy()
+        values.flush()
+        del values
+
+        dates = pd.DatetimeIndex(price_df.index).as_unit("ns").asi8
+        np.save(os.path.join(path, DATES_FILE), dates)
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump({"tickers": [str(t) for t in price_df.columns], "dtype": str(np.dtype(dtype))}, f)
+
+        return cls(path)
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def column(self, ticker: str) -> np.ndarray:
+        """
+        Returns a zero-copy view of one ticker's full history.
+        """
+        return self.values[:, self._positions[ticker]]
+
+    def columns(self, tickers: List[str]) -> np.ndarray:
+        """
+        Returns the (dates, len(tickers)) matrix for a subset of tickers.
+
+        Tickers stored at evenly spaced positions (e.g. a contiguous run)
+        are returned as a zero-copy view; any other subset is gathered,
+        which reads only the requested columns.
+
+        Args:
+            tickers (List[str]): Tickers to select, in the desired order.
+
+        Returns:
+            np.ndarray: Matrix of values with tickers as columns.
+        """
+        return self.values[:, self._column_slice(tickers)]
+
+    def row_slice(self, start: Optional[str] = None, end: Optional[str] = None) -> slice:
+        """
+        Returns the row slice covering dates in [start, end).
+        """
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), side="left")
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side="left")
+        return slice(lo, hi)
+
+    def frame(
+        self,
+        tickers: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Returns a DataFrame over the stored panel without copying when possible.
+
+        The DataFrame wraps the memory-mapped array directly for the full
+        panel, date slices and evenly spaced ticker subsets.
+
+        Args:
+            tickers (List[str]): Optional tickers to select, defaults to all.
+            start (str): Optional start date in 'YYYY-MM-DD'.
+            end (str): Optional end date in 'YYYY-MM-DD' (exclusive).
+
+        Returns:
+            pd.DataFrame: Prices with date as index and tickers as columns.
+        """
+        return self._frame(tickers, self.row_slice(start, end))
+
+    def _frame(self, tickers: Optional[List[str]], rows: slice) -> pd.DataFrame:
+        if tickers is None:
+            tickers = self.tickers
+            values = self.values[rows]
+        else:
+            # rows and columns in one indexing step, so a gathered subset
+            # only reads the requested dates rather than whole columns
+            values = self.values[rows, self._column_slice(tickers)]
+
+        df = pd.DataFrame(values, index=self.dates[rows], columns=list(tickers), copy=False)
+        df.index.name = "Date"
+        return df
+
+    def read(
+        self,
+        tickers: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Projection interface used by `lazy_panel.LazyPricePanel`.
+        """
+        return self.frame(tickers, start, end)
+
+    def read_last(
+        self,
+        tickers: List[str],
+        n: int,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Returns the last `n` rows within [start, end) for the tickers.
+        """
+        rows = self.row_slice(start, end)
+        lo = max(rows.start, rows.stop - n)
+        return self._frame(tickers, slice(lo, rows.stop))
+
+    def _column_slice(self, tickers: List[str]) -> Union[slice, List[int]]:
+        positions = [self._positions[ticker] for ticker in tickers]
+        if len(positions) == 1:
+            return slice(positions[0], positions[0] + 1)
+        if len(positions) > 1:
+            step = positions[1] - positions[0]
+            if step > 0 and all(b - a == step for a, b in zip(positions, positions[1:])):
+                return slice(positions[0], positions[-1] + 1, step)
+        return positions
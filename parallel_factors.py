@@ -0,0 +1,174 @@
+"""
+This module computes factor panels on several cores by splitting the
+ticker columns into shards.
+
+The registered factors only look at one ticker's own history, so each
+shard of tickers can be evaluated by a separate process. The prices are
+copied once into a shared memory block, laid out tickers-major so each
+shard is one contiguous slice. Workers attach to it instead of receiving
+pickled copies, and write their factor values into a preallocated shared
+output array. Per task only the shard bounds are sent; the dates and
+fundamentals reach each worker once, through the pool initializer.
+
+Factors that compare tickers with each other (e.g. a cross-sectional
+rank) cannot be sharded this way and must be computed serially.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from factor_model import FACTOR_NAMES, FactorPanel, compute_factor_panel
+from pit_fundamentals import PointInTimeStore
+from universe import UniverseStore
+
+# shards per worker, so a slow shard does not leave the other workers idle
+SHARDS_PER_WORKER = 4
+
+
+class SharedBlock(NamedTuple):
+    """
+    Picklable description of an array held in shared memory.
+    """
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype) -> Tuple["SharedBlock", shared_memory.SharedMemory]:
+        """
+        Allocates a shared memory block; the caller closes and unlinks it.
+        """
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        return cls(shm.name, tuple(shape), dtype.str), shm
+
+    def attach(self) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+        """
+        Maps the block as an array; keep the returned handle alive while
+        the array is in use.
+        """
+        shm = shared_memory.SharedMemory(name=self.name)
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf), shm
+
+
+class _WorkerState(NamedTuple):
+    prices: np.ndarray
+    out: np.ndarray
+    handles: List[shared_memory.SharedMemory]
+    index: pd.DatetimeIndex
+    tickers: List[str]
+    dates: pd.DatetimeIndex
+    fundamentals: Union[pd.DataFrame, PointInTimeStore, None]
+    momentum_window: int
+    factors: Tuple[str, ...]
+
+
+_worker: Optional[_WorkerState] = None
+
+
+def compute_factor_panel_parallel(
+    price_df: pd.DataFrame,
+    fundamentals: Union[pd.DataFrame, PointInTimeStore],
+    momentum_window: int = 126,
+    dates: Optional[Sequence] = None,
+    universe: Optional[UniverseStore] = None,
+    factors: Sequence[str] = FACTOR_NAMES,
+    workers: Optional[int] = None,
+    shards: Optional[int] = None
+) -> FactorPanel:
+    """
+    Computes the same panel as `factor_model.compute_factor_panel` with a
+    process pool over ticker shards.
+
+    Args:
+        price_df (pd.DataFrame): Daily price data with tickers as columns.
+        fundamentals (Union[pd.DataFrame, PointInTimeStore]): Fundamentals
+            indexed by ticker, or a point-in-time store.
+        momentum_window (int): Lookback window for momentum.
+        dates (Sequence): Optional dates to keep (as-of), defaults to every
+            date in `price_df`.
+        universe (UniverseStore): Optional membership; factors of
+            non-members are NaN on each date.
+        factors (Sequence[str]): Registered factors to compute; each must
+            depend only on the ticker's own data.
+        workers (int): Number of processes, defaults to the number of CPUs.
+            With one worker the panel is computed in this process.
+        shards (int): Number of ticker shards, defaults to
+            `SHARDS_PER_WORKER` per worker.
+
+    Returns:
+        FactorPanel: Raw factors, shape (dates, tickers, factors).
+    """
+    workers = workers or os.cpu_count() or 1
+    tickers = list(price_df.columns)
+    if workers == 1 or len(tickers) < 2:
+        return compute_factor_panel(price_df, fundamentals, momentum_window, dates, universe, factors)
+
+    dates = pd.DatetimeIndex(price_df.index if dates is None else dates)
+    dtype = price_df.dtypes.iloc[0] if price_df.dtypes.iloc[0].kind == "f" else np.dtype("float64")
+    factors = tuple(factors)
+    n_shards = min(shards or workers * SHARDS_PER_WORKER, len(tickers))
+    bounds = np.linspace(0, len(tickers), n_shards + 1).astype(int)
+
+    prices_block, prices_shm = SharedBlock.create((len(tickers), len(price_df)), dtype)
+    out_block, out_shm = SharedBlock.create((len(dates), len(tickers), len(factors)), dtype)
+    try:
+        # tickers-major, so each shard is a contiguous range of rows
+        shared_prices = np.ndarray(prices_block.shape, dtype=dtype, buffer=prices_shm.buf)
+        shared_prices[:] = price_df.to_numpy(dtype=dtype).T
+        del shared_prices
+
+        initargs = (
+            prices_block, out_block, pd.DatetimeIndex(price_df.index), tickers,
+            dates, fundamentals, momentum_window, factors
+        )
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            # consume the results so worker exceptions are raised here
+            list(pool.map(_compute_shard, bounds[:-1], bounds[1:]))
+
+        values = np.array(np.ndarray(out_block.shape, dtype=dtype, buffer=out_shm.buf))
+    finally:
+        for shm in (prices_shm, out_shm):
+            shm.close()
+            shm.unlink()
+
+    if universe is not None:
+        values[~universe.mask(dates, tickers).to_numpy()] = np.nan
+
+    return FactorPanel(values, dates, tickers, factors)
+
+
+def _init_worker(
+    prices_block: SharedBlock,
+    out_block: SharedBlock,
+    index: pd.DatetimeIndex,
+    tickers: List[str],
+    dates: pd.DatetimeIndex,
+    fundamentals: Union[pd.DataFrame, PointInTimeStore, None],
+    momentum_window: int,
+    factors: Tuple[str, ...]
+) -> None:
+    global _worker
+    prices, prices_shm = prices_block.attach()
+    out, out_shm = out_block.attach()
+    _worker = _WorkerState(
+        prices, out, [prices_shm, out_shm], index, tickers, dates, fundamentals, momentum_window, factors
+    )
+
+
+def _compute_shard(start: int, stop: int) -> None:
+    state = _worker
+    # a transposed view of the shared rows: no copy of the prices
+    shard_prices = pd.DataFrame(
+        state.prices[start:stop].T, index=state.index, columns=state.tickers[start:stop], copy=False
+    )
+    panel = compute_factor_panel(
+        shard_prices, state.fundamentals, state.momentum_window, state.dates, factors=state.factors
+    )
+    state.out[:, start:stop, :] = panel.values
@@ -0,0 +1,211 @@
+"""
+This module provides a point-in-time store for fundamental data.
+
+Each fundamentals snapshot is recorded with the timestamp at which it
+was known. Queries return, for every (date, ticker) pair, the latest
+value recorded at or before that date, which keeps historical factor
+computations free of look-ahead bias.
+
+As-of lookups are vectorized: records are sorted once by (ticker, time)
+and every query pair is resolved with a single `np.searchsorted` over
+integer composite keys, so fundamentals for all rebalance dates and all
+tickers are pulled in one pass.
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class PointInTimeStore:
+    """
+    Timestamped fundamentals with vectorized as-of queries.
+
+    Records are held in long format (ticker, timestamp, field columns)
+    and optionally persisted to a Parquet file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str): Optional Parquet file backing the store.
+        """
+        self.path = path
+        self._records = pd.DataFrame(columns=["ticker", "timestamp"])
+        self._pending: List[pd.DataFrame] = []
+        self._indexes: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+        if path is not None and os.path.exists(path):
+            self._records = pd.read_parquet(path)
+
+    def record(self, snapshot: pd.DataFrame, timestamp, only_changed: bool = False) -> None:
+        """
+        Records a fundamentals snapshot as known at `timestamp`.
+
+        Args:
+            snapshot (pd.DataFrame): Fundamentals indexed by ticker, as
+                returned by `data_fetcher.fetch_fundamentals`.
+            timestamp: Time at which the values were known.
+            only_changed (bool): Skip tickers whose non-missing values all
+                equal the latest known ones, so recording the same snapshot
+                on every run does not grow the store.
+        """
+        if only_changed and len(self.records):
+            snapshot = snapshot[self._changed(snapshot, timestamp)]
+            if snapshot.empty:
+                return
+        records = snapshot.rename_axis("ticker").reset_index()
+        records.insert(1, "timestamp", pd.Timestamp(timestamp))
+        self.record_many(records)
+
+    def record_many(self, records: pd.DataFrame) -> None:
+        """
+        Records long-format rows with 'ticker', 'timestamp' and field columns.
+
+        Args:
+            records (pd.DataFrame): Rows to append. Later records for the
+                same ticker and timestamp override earlier ones.
+        """
+        records = records.copy()
+        records["timestamp"] = pd.to_datetime(records["timestamp"]).astype("datetime64[ns]")
+        self._pending.append(records)
+        self._indexes.clear()
+
+    def save(self) -> None:
+        """
+        Writes all records to the backing Parquet file.
+        """
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.records.to_parquet(self.path + ".tmp", index=False)
+        os.replace(self.path + ".tmp", self.path)
+
+    @property
+    def records(self) -> pd.DataFrame:
+        """
+        All records in insertion order.
+        """
+        if self._pending:
+            frames = [self._records] if len(self._records) else []
+            self._records = pd.concat(frames + self._pending, ignore_index=True)
+            self._pending = []
+        return self._records
+
+    @property
+    def fields(self) -> List[str]:
+        return [c for c in self.records.columns if c not in ("ticker", "timestamp")]
+
+    @property
+    def tickers(self) -> List[str]:
+        return sorted(self.records["ticker"].unique())
+
+    def as_of(
+        self,
+        dates: Sequence,
+        field: str,
+        tickers: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Returns the latest known value of a field for every date and ticker.
+
+        Records with a missing value for the field are ignored, so the
+        most recent non-missing value is returned.
+
+        Args:
+            dates (Sequence): Query dates.
+            field (str): Fundamental field, e.g. 'trailingPE'.
+            tickers (List[str]): Tickers to return, defaults to all recorded.
+
+        Returns:
+            pd.DataFrame: Values with dates as index and tickers as columns
+            (NaN where nothing was known yet).
+        """
+        dates = pd.DatetimeIndex(dates).astype("datetime64[ns]")
+        tickers = self.tickers if tickers is None else list(tickers)
+        keys, times, values = self._index(field)
+
+        ticker_codes = pd.Index(self._ticker_universe()).get_indexer(tickers)
+
+        # rank each query date among the recorded timestamps: r is the number
+        # of distinct timestamps <= date, so 0 means "before any record"
+        date_ranks = np.searchsorted(times, dates.asi8, side="right")
+        n_ranks = len(times) + 1
+
+        query = ticker_codes[np.newaxis, :].astype(np.int64) * n_ranks + date_ranks[:, np.newaxis]
+        pos = np.searchsorted(keys, query, side="right") - 1
+
+        # a hit must belong to the same ticker (and so lie at or before the date)
+        safe_pos = np.clip(pos, 0, max(len(keys) - 1, 0))
+        valid = (pos >= 0) & (ticker_codes[np.newaxis, :] >= 0)
+        if len(keys):
+            valid &= (keys[safe_pos] // n_ranks) == ticker_codes[np.newaxis, :]
+            result = np.where(valid, values[safe_pos], np.nan)
+        else:
+            result = np.full(query.shape, np.nan)
+
+        return pd.DataFrame(result, index=dates, columns=tickers)
+
+    def snapshot(self, date, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns all fields as known on `date`, shaped like `fetch_fundamentals`.
+
+        Args:
+            date: Query date.
+            tickers (List[str]): Tickers to return, defaults to all recorded.
+
+        Returns:
+            pd.DataFrame: Fundamentals indexed by ticker.
+        """
+        tickers = self.tickers if tickers is None else list(tickers)
+        columns = {field: self.as_of([date], field, tickers).iloc[0] for field in self.fields}
+        df = pd.DataFrame(columns, index=pd.Index(tickers, name="ticker"))
+        return df
+
+    def _changed(self, snapshot: pd.DataFrame, timestamp) -> np.ndarray:
+        # missing values are skipped by `as_of`, so only non-missing ones
+        # that differ from the latest known value count as a change
+        known = self.snapshot(timestamp, list(snapshot.index)).reindex(columns=snapshot.columns)
+        new = snapshot.to_numpy(dtype="float64")
+        with np.errstate(invalid="ignore"):
+            return (~np.isnan(new) & (new != known.to_numpy(dtype="float64"))).any(axis=1)
+
+    def _ticker_universe(self) -> np.ndarray:
+        return np.asarray(self.tickers, dtype=object)
+
+    def _index(self, field: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Builds (and caches) the sorted composite keys for one field.
+
+        Returns:
+            keys: sorted int64 keys, ticker_code * n_ranks + time_rank
+            times: distinct recorded timestamps (int64 ns), ascending
+            values: field values aligned with `keys`
+        """
+        if field in self._indexes:
+            return self._indexes[field]
+
+        records = self.records
+        if field not in records.columns:
+            raise KeyError(f"Unknown fundamental field '{field}'")
+
+        values = pd.to_numeric(records[field], errors="coerce").to_numpy(dtype="float64")
+        present = ~np.isnan(values)
+
+        codes = pd.Index(self._ticker_universe()).get_indexer(records["ticker"])[present].astype(np.int64)
+        stamps = pd.DatetimeIndex(records["timestamp"]).asi8[present]
+        values = values[present]
+
+        times = np.unique(stamps)
+        ranks = np.searchsorted(times, stamps, side="left") + 1
+        keys = codes * (len(times) + 1) + ranks
+
+        # stable sort keeps insertion order among duplicates, so the last
+        # recorded value wins for a repeated (ticker, timestamp)
+        order = np.argsort(keys, kind="stable")
+        self._indexes[field] = (keys[order], times, values[order])
+        return self._indexes[field]
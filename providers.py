@@ -0,0 +1,281 @@
+"""
+This module defines the data-provider interface used by data_fetcher,
+along with the available backends:
+- YFinanceProvider: live data from Yahoo Finance
+- ParquetDirProvider / CSVDirProvider: local directories of files
+- FakeProvider: deterministic synthetic data, no I/O at all
+
+Local directory layout:
+    <root>/prices/<ticker>.<ext>       columns: date, close
+    <root>/fundamentals.<ext>          columns: ticker, <fields...>
+"""
+
+import os
+import zlib
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class DataProvider:
+    """
+    Base class for price and fundamental data sources.
+
+    Subclasses implement `get_prices` and `get_fundamentals`.
+    """
+
+    def key(self) -> tuple:
+        """
+        Returns a hashable identity used to coalesce identical requests.
+
+        Two providers with equal keys must return the same data.
+        """
+        return (type(self).__name__,)
+
+    def get_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        """
+        Returns daily close prices for the tickers.
+
+        Args:
+            tickers (List[str]): List of stock tickers.
+            start (str): Start date in 'YYYY-MM-DD'.
+            end (str): End date in 'YYYY-MM-DD' (exclusive).
+
+        Returns:
+            pd.DataFrame: DataFrame with date as index and tickers as columns.
+        """
+        raise NotImplementedError
+
+    def get_fundamentals(self, ticker: str) -> dict:
+        """
+        Returns the raw fundamental fields available for one ticker.
+
+        Args:
+            ticker (str): Stock ticker.
+
+        Returns:
+            dict: {field: value}; unknown tickers return an empty dict.
+        """
+        raise NotImplementedError
+
+
+class YFinanceProvider(DataProvider):
+    """
+    Provider backed by the yfinance package.
+    """
+
+    def get_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        return yf.download(tickers, start=start, end=end, auto_adjust=False)["Close"]
+
+    def get_fundamentals(self, ticker: str) -> dict:
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info
+
+
+class LocalDirProvider(DataProvider):
+    """
+    Provider reading one price file per ticker from a local directory.
+
+    Subclasses define the file extension and how a table is read.
+    """
+
+    extension = ""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): Dataset root directory.
+        """
+        self.root = root
+        self._fundamentals = None
+
+    def key(self) -> tuple:
+        return (type(self).__name__, os.path.abspath(self.root))
+
+    def get_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+
+        series = {}
+        for ticker in tickers:
+            path = os.path.join(self.root, "prices", f"{ticker}.{self.extension}")
+            if not os.path.exists(path):
+                continue
+            table = self._read_table(path)
+            close = pd.Series(
+                table["close"].to_numpy(dtype="float64"),
+                index=pd.DatetimeIndex(table["date"])
+            )
+            series[ticker] = close[(close.index >= start_ts) & (close.index < end_ts)]
+
+        df = pd.DataFrame(series, columns=tickers)
+        df.index.name = "Date"
+        return df.sort_index()
+
+    def get_fundamentals(self, ticker: str) -> dict:
+        if self._fundamentals is None:
+            path = os.path.join(self.root, f"fundamentals.{self.extension}")
+            if os.path.exists(path):
+                self._fundamentals = self._read_table(path).set_index("ticker")
+            else:
+                self._fundamentals = pd.DataFrame()
+
+        if ticker not in self._fundamentals.index:
+            return {}
+        row = self._fundamentals.loc[ticker]
+        return {field: (None if pd.isna(value) else value) for field, value in row.items()}
+
+    def _read_table(self, path: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class ParquetDirProvider(LocalDirProvider):
+    """
+    Local provider reading Parquet files.
+    """
+
+    extension = "parquet"
+
+    def _read_table(self, path: str) -> pd.DataFrame:
+        return pd.read_parquet(path)
+
+
+class CSVDirProvider(LocalDirProvider):
+    """
+    Local provider reading CSV files.
+    """
+
+    extension = "csv"
+
+    def _read_table(self, path: str) -> pd.DataFrame:
+        return pd.read_csv(path)
+
+
+class FakeProvider(DataProvider):
+    """
+    Deterministic in-memory provider producing synthetic data.
+
+    Each ticker follows a geometric random walk seeded from its name and
+    anchored at a fixed origin date, so any date range of a ticker is
+    always the same slice of the same path.
+    """
+
+    origin = pd.Timestamp("2000-01-03")
+
+    def __init__(self, seed: int = 0, annual_vol: float = 0.3):
+        """
+        Args:
+            seed (int): Global seed mixed into every ticker's stream.
+            annual_vol (float): Annualized volatility of the simulated paths.
+        """
+        self.seed = seed
+        self.annual_vol = annual_vol
+
+    def key(self) -> tuple:
+        return (type(self).__name__, self.seed, self.annual_vol)
+
+    def get_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        dates = pd.bdate_range(self.origin, end_ts, inclusive="left")
+        keep = dates >= start_ts
+
+        daily_vol = self.annual_vol / np.sqrt(252)
+        data = {}
+        for ticker in tickers:
+            rng = self._rng(ticker)
+            drift = rng.normal(0.0003, 0.0003)
+            log_returns = rng.normal(drift, daily_vol, size=len(dates))
+            data[ticker] = (100 * np.exp(np.cumsum(log_returns)))[keep]
+
+        df = pd.DataFrame(data, index=dates[keep], columns=tickers)
+        df.index.name = "Date"
+        return df
+
+    def get_fundamentals(self, ticker: str) -> dict:
+        rng = self._rng(ticker)
+        return {
+            "marketCap": float(np.exp(rng.uniform(np.log(1e9), np.log(3e12)))),
+            "trailingPE": float(rng.uniform(5, 60)),
+            "priceToBook": float(rng.uniform(0.5, 20)),
+            "dividendYield": float(rng.uniform(0, 0.05)),
+        }
+
+    def _rng(self, ticker: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+
+
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "parquet": ParquetDirProvider,
+    "csv": CSVDirProvider,
+    "fake": FakeProvider,
+}
+
+
+def make_provider(name: str, data_dir: Optional[str] = None) -> DataProvider:
+    """
+    Builds a provider by name.
+
+    Args:
+        name (str): One of 'yfinance', 'parquet', 'csv', 'fake' or 'replay'.
+        data_dir (str): Dataset (or fixture) root, required for the local providers.
+
+    Returns:
+        DataProvider: The configured provider.
+    """
+    if name == "replay":
+        # imported here since replay builds on this module
+        from replay import ReplayProvider
+
+        if data_dir is None:
+            raise ValueError("Provider 'replay' requires a fixture directory.")
+        return ReplayProvider(data_dir)
+
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown data provider '{name}'. Choose from {sorted(PROVIDERS) + ['replay']}.")
+
+    provider_cls = PROVIDERS[name]
+    if issubclass(provider_cls, LocalDirProvider):
+        if data_dir is None:
+            raise ValueError(f"Provider '{name}' requires a data directory.")
+        return provider_cls(data_dir)
+    return provider_cls()
+
+
+def export_dataset(
+    root: str,
+    price_df: pd.DataFrame,
+    fundamentals_df: Optional[pd.DataFrame] = None,
+    fmt: str = "parquet"
+) -> None:
+    """
+    Writes a price panel (and fundamentals) in the local provider layout.
+
+    Useful for snapshotting live data once and replaying it offline.
+
+    Args:
+        root (str): Dataset root directory.
+        price_df (pd.DataFrame): Close prices with tickers as columns.
+        fundamentals_df (pd.DataFrame): Optional fundamentals indexed by ticker.
+        fmt (str): 'parquet' or 'csv'.
+    """
+    if fmt not in ("parquet", "csv"):
+        raise ValueError("fmt must be 'parquet' or 'csv'")
+
+    def write(df: pd.DataFrame, path: str) -> None:
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+    os.makedirs(os.path.join(root, "prices"), exist_ok=True)
+    for ticker in price_df.columns:
+        close = price_df[ticker].dropna()
+        table = pd.DataFrame({"date": close.index, "close": close.to_numpy()})
+        write(table, os.path.join(root, "prices", f"{ticker}.{fmt}"))
+
+    if fundamentals_df is not None:
+        write(fundamentals_df.rename_axis("ticker").reset_index(), os.path.join(root, f"fundamentals.{fmt}"))
@@ -0,0 +1,156 @@
+"""
+This module provides a record/replay harness for the data layer.
+
+- RecordingProvider wraps any provider and saves every response to a
+  fixture directory.
+- ReplayProvider serves those fixtures back with configurable simulated
+  latency and failure rate, so fetch concurrency, caching and retry
+  behaviour can be tested and benchmarked deterministically offline.
+
+Prices are recorded per ticker (merged across requests), so fixtures can
+be replayed with a different chunking or date range than they were
+recorded with.
+
+Fixture layout:
+    <dir>/prices/<ticker>.parquet          columns: date, close
+    <dir>/fundamentals/<ticker>.json       raw provider fields
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+from providers import DataProvider, ParquetDirProvider
+
+
+class SimulatedProviderError(RuntimeError):
+    """
+    Raised by ReplayProvider to simulate a failed provider request.
+    """
+
+
+class RecordingProvider(DataProvider):
+    """
+    Pass-through provider that records responses as fixtures.
+    """
+
+    def __init__(self, inner: DataProvider, fixture_dir: str):
+        """
+        Args:
+            inner (DataProvider): Provider whose responses are recorded.
+            fixture_dir (str): Directory the fixtures are written to.
+        """
+        self.inner = inner
+        self.fixture_dir = fixture_dir
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(fixture_dir, "prices"), exist_ok=True)
+        os.makedirs(os.path.join(fixture_dir, "fundamentals"), exist_ok=True)
+
+    def key(self) -> tuple:
+        return self.inner.key()
+
+    def get_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        df = self.inner.get_prices(tickers, start, end)
+        if isinstance(df, pd.Series):
+            df = df.to_frame(name=tickers[0])
+
+        with self._lock:
+            for ticker in df.columns:
+                self._merge_prices(ticker, df[ticker].dropna())
+        return df
+
+    def get_fundamentals(self, ticker: str) -> dict:
+        info = self.inner.get_fundamentals(ticker)
+        path = os.path.join(self.fixture_dir, "fundamentals", f"{ticker}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(info, f, default=str)
+        os.replace(path + ".tmp", path)
+        return info
+
+    def _merge_prices(self, ticker: str, close: pd.Series) -> None:
+        path = os.path.join(self.fixture_dir, "prices", f"{ticker}.parquet")
+        close = pd.Series(close.to_numpy(dtype="float64"), index=pd.DatetimeIndex(close.index).tz_localize(None))
+        if os.path.exists(path):
+            existing = pd.read_parquet(path)
+            existing = pd.Series(existing["close"].to_numpy(), index=pd.DatetimeIndex(existing["date"]))
+            close = pd.concat([existing, close])
+            close = close[~close.index.duplicated(keep="last")].sort_index()
+
+        table = pd.DataFrame({"date": close.index, "close": close.to_numpy()})
+        table.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+
+class ReplayProvider(DataProvider):
+    """
+    Provider serving recorded fixtures with simulated latency and failures.
+
+    Every request first sleeps for `latency` seconds (plus up to
+    `jitter` * latency of random extra delay and `latency_per_ticker` per
+    requested ticker), then fails with probability `failure_rate`.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: str,
+        latency: float = 0.0,
+        latency_per_ticker: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            fixture_dir (str): Directory written by RecordingProvider.
+            latency (float): Base delay per request in seconds.
+            latency_per_ticker (float): Extra delay per requested ticker in seconds.
+            jitter (float): Maximum random extra delay, as a fraction of the total delay.
+            failure_rate (float): Probability that a request raises SimulatedProviderError.
+            seed (int): Seed for the latency/failure draws.
+        """
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.latency_per_ticker = latency_per_ticker
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+
+        self.requests = 0
+        self.failures = 0
+
+        self._prices = ParquetDirProvider(fixture_dir)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def key(self) -> tuple:
+        return (type(self).__name__, os.path.abspath(self.fixture_dir))
+
+    def get_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        self._simulate(len(tickers))
+        return self._prices.get_prices(tickers, start, end)
+
+    def get_fundamentals(self, ticker: str) -> dict:
+        self._simulate(1)
+        path = os.path.join(self.fixture_dir, "fundamentals", f"{ticker}.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _simulate(self, n_tickers: int) -> None:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self.latency_per_ticker * n_tickers
+            delay *= 1 + self.jitter * self._rng.random()
+            failed = self._rng.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise SimulatedProviderError("simulated provider failure")
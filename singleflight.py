@@ -0,0 +1,66 @@
+"""
+This module provides request coalescing ("single-flight") for the data
+layer: concurrent calls with the same key share one execution and all
+receive its result (or its exception).
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    The first caller for a key (the leader) runs the function; callers
+    arriving while it is in flight block and receive the same result
+    object, so they must not mutate it in place. Once the call finishes
+    the key is released, and later calls run the function again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Runs `fn` unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identity of the request.
+            fn (Callable): Zero-argument function performing the request.
+
+        Returns:
+            The result of `fn`, shared with all concurrent callers.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        """
+        Returns the number of keys currently being fetched.
+        """
+        with self._lock:
+            return len(self._calls)
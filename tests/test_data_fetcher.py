@@ -0,0 +1,108 @@
+"""
+Tests of `data_fetcher.fetch_price_data`: request coalescing and ticker handling.
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import throttle
+from data_fetcher import _inflight, fetch_price_data
+from providers import FakeProvider
+
+TICKERS = ["A", "B"]
+START, END = "2020-01-01", "2021-01-01"
+CALLERS = 8
+
+
+class GatedProvider(FakeProvider):
+    """
+    FakeProvider whose downloads wait for `release` and are counted;
+    with `error` set they raise it instead of returning prices.
+    """
+
+    def __init__(self, error=None):
+        super().__init__()
+        self.release = threading.Event()
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_prices(self, tickers, start, end):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return super().get_prices(tickers, start, end)
+
+
+def call_concurrently(fn, callers=CALLERS, release=None):
+    """
+    Runs `fn` on `callers` threads started together and returns the
+    result or exception of each.
+    """
+    outcomes = [None] * callers
+    barrier = threading.Barrier(callers)
+
+    def run(i):
+        barrier.wait()
+        try:
+            outcomes[i] = fn()
+        except Exception as exc:
+            outcomes[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    if release is not None:
+        # let every caller reach the in-flight request before it completes
+        time.sleep(0.2)
+        release.set()
+    for thread in threads:
+        thread.join(10)
+    return outcomes
+
+
+def test_concurrent_identical_fetches_share_one_download():
+    provider = GatedProvider()
+    results = call_concurrently(
+        lambda: fetch_price_data(TICKERS, START, END, provider=provider), release=provider.release
+    )
+
+    assert provider.calls == 1
+    assert all(result is results[0] for result in results)
+    assert list(results[0].columns) == TICKERS
+    assert _inflight.in_flight() == 0
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached(monkeypatch):
+    monkeypatch.setattr(throttle.time, "sleep", lambda seconds: None)
+    error = ConnectionError("provider down")
+    provider = GatedProvider(error)
+    outcomes = call_concurrently(
+        lambda: fetch_price_data(TICKERS, START, END, provider=provider), release=provider.release
+    )
+
+    assert all(outcome is error for outcome in outcomes)
+    # one download, retried by the leader alone
+    calls = provider.calls
+    assert calls == 3
+
+    with pytest.raises(ConnectionError):
+        fetch_price_data(TICKERS, START, END, provider=provider)
+    assert provider.calls == calls + 3
+    assert _inflight.in_flight() == 0
+
+    provider.error = None
+    assert list(fetch_price_data(TICKERS, START, END, provider=provider).columns) == TICKERS
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_duplicate_tickers_give_one_column_each(tmp_path, cached):
+    cache_dir = str(tmp_path) if cached else None
+    df = fetch_price_data(["B", "A", "B", "A"], START, END, cache_dir=cache_dir, provider=FakeProvider())
+    assert list(df.columns) == ["B", "A"]
+    pd.testing.assert_frame_equal(df, FakeProvider().get_prices(["B", "A"], START, END), check_freq=False)
@@ -0,0 +1,73 @@
+"""
+Tests of `data_quality.validate_prices` on synthetic prices with
+injected splits, stale runs, outliers and gaps.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_quality import validate_prices
+from providers import FakeProvider
+
+
+@pytest.fixture
+def clean():
+    return FakeProvider().get_prices(["A", "B", "C", "D", "E"], "2020-01-01", "2022-01-01")
+
+
+@pytest.fixture
+def dirty(clean):
+    prices = clean.copy()
+    prices.iloc[200:, 0] /= 2  # A: 2-for-1 split
+    prices.iloc[101:106, 1] = prices.iloc[100, 1]  # B: six identical closes
+    prices.iloc[300, 2] *= 1.6  # C: one-day +60% spike
+    prices.iloc[50:53, 3] = np.nan  # D: three missing days
+    return prices
+
+
+def issues(report: pd.DataFrame, ticker: str) -> list:
+    rows = report[report["ticker"] == ticker]
+    return list(zip(rows["issue"], rows["date"], rows["value"]))
+
+
+def test_clean_prices_pass_unchanged(clean):
+    adjusted, report = validate_prices(clean)
+    pd.testing.assert_frame_equal(adjusted, clean)
+    assert report.empty
+    assert list(report.columns) == ["date", "ticker", "issue", "value"]
+
+
+def test_each_issue_is_reported_once(dirty):
+    _, report = validate_prices(dirty)
+    dates = dirty.index
+    assert issues(report, "A") == [("split", dates[200], 0.5)]
+    assert issues(report, "B") == [("stale_price", dates[105], 6.0)]
+    assert [issue for issue, _, _ in issues(report, "C")] == ["outlier_return", "outlier_return"]
+    assert issues(report, "C")[0][1] == dates[300]
+    assert issues(report, "D") == [("gap", dates[52], 3.0)]
+    assert issues(report, "E") == []
+
+
+def test_split_is_back_adjusted(clean, dirty):
+    adjusted, _ = validate_prices(dirty)
+    np.testing.assert_allclose(adjusted["A"], clean["A"] / 2, rtol=1e-12)
+    pd.testing.assert_frame_equal(adjusted.drop(columns="A"), dirty.drop(columns="A"))
+
+
+def test_split_adjustment_can_be_disabled(dirty):
+    adjusted, report = validate_prices(dirty, adjust_splits=False)
+    pd.testing.assert_frame_equal(adjusted, dirty)
+    assert ("split", dirty.index[200], 0.5) in issues(report, "A")
+
+
+def test_ordinary_large_move_is_not_a_split(clean):
+    prices = clean.copy()
+    prices.iloc[200:, 0] *= 0.62  # -38%: near 2/3 but outside the tolerance
+    _, report = validate_prices(prices)
+    assert [issue for issue, _, _ in issues(report, "A")] == ["outlier_return"]
+
+
+def test_keeps_float32(clean):
+    adjusted, _ = validate_prices(clean.astype("float32"))
+    assert (adjusted.dtypes == "float32").all()
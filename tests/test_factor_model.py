@@ -0,0 +1,55 @@
+"""
+Tests of `factor_model.select_top_n` and `rank_stocks`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from factor_model import rank_stocks, select_top_n
+
+
+def test_selects_highest_scores_in_descending_order():
+    rng = np.random.default_rng(0)
+    scores = rng.normal(size=(50, 40))
+    top = select_top_n(scores, 7)
+    expected = np.argsort(-scores, axis=-1)[:, :7]
+    np.testing.assert_array_equal(top, expected)
+
+
+def test_single_row():
+    np.testing.assert_array_equal(select_top_n(np.array([0.5, 2.0, -1.0, 1.0]), 2), [1, 3])
+
+
+def test_ties_select_tied_values_once_each():
+    scores = np.array([[1.0, 3.0, 3.0, 2.0], [3.0, 1.0, 2.0, 2.0], [1.0, 1.0, 1.0, 1.0]])
+    top = select_top_n(scores, 2)
+    assert sorted(top[0]) == [1, 2]
+    assert top[1, 0] == 0 and top[1, 1] in (2, 3)
+    assert len(set(top[2])) == 2
+    np.testing.assert_array_equal(np.take_along_axis(scores, top, axis=-1), [[3, 3], [3, 2], [1, 1]])
+
+
+def test_missing_scores_are_never_selected():
+    scores = np.array([[np.nan, 1.0, np.nan, -np.inf], [np.nan, np.nan, np.nan, np.nan]])
+    np.testing.assert_array_equal(select_top_n(scores, 3), [[1, 3, -1], [-1, -1, -1]])
+
+
+def test_top_n_beyond_width_is_padded():
+    scores = np.array([[2.0, 1.0, 3.0]])
+    np.testing.assert_array_equal(select_top_n(scores, 5), [[2, 0, 1, -1, -1]])
+
+
+@pytest.mark.parametrize("top_n", [0, -1])
+def test_empty_selection(top_n):
+    assert select_top_n(np.ones((4, 3)), top_n).shape == (4, max(top_n, 0))
+
+
+def test_rank_stocks_matches_nlargest():
+    rng = np.random.default_rng(1)
+    scores = pd.DataFrame(rng.normal(size=(30, 3)), index=[f"T{i}" for i in range(30)])
+    scores.iloc[[3, 7], 1] = np.nan
+    ranked = rank_stocks(scores, top_n=5)
+    expected = scores.mean(axis=1).nlargest(5)
+    assert list(ranked.index) == list(expected.index)
+    np.testing.assert_allclose(ranked["combined_score"], expected.to_numpy())
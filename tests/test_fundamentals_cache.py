@@ -0,0 +1,87 @@
+"""
+Tests of `fundamentals_cache.FundamentalsCache` expiry and eviction.
+"""
+
+from fundamentals_cache import DAY, FundamentalsCache
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_fields_expire_after_their_own_ttl():
+    clock = Clock()
+    cache = FundamentalsCache(ttls={"marketCap": DAY, "priceToBook": 7 * DAY}, clock=clock)
+    cache.put("A", {"marketCap": 1e9, "priceToBook": 2.0})
+
+    clock.now = DAY - 1
+    assert cache.get("A", ["marketCap", "priceToBook"]) == {"marketCap": 1e9, "priceToBook": 2.0}
+
+    clock.now = DAY
+    assert cache.get("A", ["marketCap"]) is None
+    assert cache.get("A", ["marketCap", "priceToBook"]) is None
+    assert cache.get("A", ["priceToBook"]) == {"priceToBook": 2.0}
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+
+def test_put_refreshes_only_the_fields_it_stores():
+    clock = Clock()
+    cache = FundamentalsCache(ttls={"marketCap": DAY, "priceToBook": DAY}, clock=clock)
+    cache.put("A", {"marketCap": 1e9, "priceToBook": 2.0})
+    clock.now = DAY - 1
+    cache.put("A", {"marketCap": 2e9})
+
+    clock.now = DAY
+    assert cache.get("A", ["marketCap"]) == {"marketCap": 2e9}
+    assert cache.get("A", ["priceToBook"]) is None
+
+
+def test_missing_field_is_a_miss():
+    cache = FundamentalsCache(clock=Clock())
+    cache.put("A", {"marketCap": 1e9})
+    assert cache.get("A", ["marketCap", "trailingPE"]) is None
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    cache = FundamentalsCache(max_entries=2, clock=Clock())
+    cache.put("A", {"marketCap": 1.0})
+    cache.put("B", {"marketCap": 2.0})
+    assert cache.get("A", ["marketCap"]) is not None  # A is now more recent than B
+    cache.put("C", {"marketCap": 3.0})
+
+    assert cache.get("B", ["marketCap"]) is None
+    assert cache.get("A", ["marketCap"]) == {"marketCap": 1.0}
+    assert cache.get("C", ["marketCap"]) == {"marketCap": 3.0}
+    assert cache.stats()["entries"] == 2
+
+
+def test_evicts_down_to_max_bytes():
+    cache = FundamentalsCache(max_entries=None, clock=Clock())
+    cache.put("A", {"marketCap": 1.0})
+    entry_bytes = cache.stats()["bytes"]
+    cache.max_bytes = 2 * entry_bytes
+    cache.put("B", {"marketCap": 2.0})
+    cache.put("C", {"marketCap": 3.0})
+
+    assert cache.get("A", ["marketCap"]) is None
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_save_and_load_keep_lru_order(tmp_path):
+    path = str(tmp_path / "fundamentals.json")
+    clock = Clock()
+    cache = FundamentalsCache(path, max_entries=2, clock=clock)
+    cache.put("A", {"marketCap": 1.0})
+    cache.put("B", {"marketCap": 2.0})
+    cache.get("A", ["marketCap"])
+    cache.save()
+
+    reloaded = FundamentalsCache(path, max_entries=2, clock=clock)
+    reloaded.put("C", {"marketCap": 3.0})
+    assert reloaded.get("B", ["marketCap"]) is None
+    assert reloaded.get("A", ["marketCap"]) == {"marketCap": 1.0}
@@ -0,0 +1,48 @@
+"""
+Tests of `intraday` bar loading and resampling.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from intraday import load_intraday_bars, resample_ohlcv
+
+
+@pytest.fixture
+def bar_file(tmp_path):
+    stamps = pd.date_range("2024-01-02 09:30", periods=10, freq="min")
+    bars = pd.DataFrame({
+        "timestamp": np.repeat(stamps, 2),
+        "ticker": ["A", "B"] * 10,
+        "open": 100.25,
+        "high": 101.0,
+        "low": 99.5,
+        "close": 100.75,
+        "volume": 123_456_789,  # not representable in float32
+    })
+    path = tmp_path / "bars.csv"
+    bars.to_csv(path, index=False)
+    return str(path)
+
+
+def test_volume_keeps_full_precision_with_float32_prices(bar_file):
+    bars = load_intraday_bars(bar_file, dtype="float32")
+    assert (bars.close.dtypes == "float32").all()
+    assert (bars.volume.dtypes == "float64").all()
+    assert (bars.volume == 123_456_789).all().all()
+
+    resampled = resample_ohlcv(bars, "5min")
+    assert (resampled.close.dtypes == "float32").all()
+    assert (resampled.volume == 5 * 123_456_789).all().all()
+
+
+def test_resample_aggregates_ohlcv(bar_file):
+    bars = load_intraday_bars(bar_file, dtype="float64")
+    bars.close.iloc[7, 0] = np.nan  # last valid close of the second bar is row 9
+    bars.close.iloc[9, 0] = 102.0
+    resampled = resample_ohlcv(bars, "5min")
+    assert list(resampled.close.index) == list(pd.date_range("2024-01-02 09:30", periods=2, freq="5min"))
+    assert resampled.close.iloc[1, 0] == 102.0
+    assert resampled.open.iloc[0, 0] == 100.25
+    assert resampled.high.iloc[0, 1] == 101.0 and resampled.low.iloc[0, 1] == 99.5
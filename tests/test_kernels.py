@@ -0,0 +1,51 @@
+"""
+Tests of the rolling moments in `kernels` against pandas, for both the
+NumPy fallback and the loop bodies compiled when numba is installed.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import kernels
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0.0, 0.02, size=(300, 8))
+    x[rng.random(x.shape) < 0.05] = np.nan  # scattered gaps
+    x[40:90, 2] = np.nan                    # a gap longer than the window
+    x[:120, 5] = np.nan                     # a late listing
+    x[:, 7] = np.nan                        # never traded
+    return x
+
+
+def compiled_body(fn):
+    # the pure Python loop of a numba kernel, or the plain function without numba
+    return getattr(fn, "py_func", fn)
+
+
+@pytest.fixture(params=[False, True], ids=["numpy", "loops"])
+def use_loops(request, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(kernels, "USE_NUMBA", True)
+        compiled = getattr(kernels, "_nb_rolling_moments", kernels._nb_rolling_moments_impl)
+        monkeypatch.setattr(kernels, "_nb_rolling_moments", compiled_body(compiled), raising=False)
+    else:
+        monkeypatch.setattr(kernels, "USE_NUMBA", False)
+    return request.param
+
+
+@pytest.mark.parametrize("window, min_periods", [(21, None), (21, 10), (1, None)])
+def test_rolling_mean_matches_pandas(returns, use_loops, window, min_periods):
+    expected = pd.DataFrame(returns).rolling(window, min_periods=min_periods).mean().to_numpy()
+    result = kernels.rolling_mean(returns, window, min_periods)
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-14)
+
+
+@pytest.mark.parametrize("window, min_periods, ddof", [(21, None, 1), (21, 10, 1), (21, None, 0), (2, None, 1)])
+def test_rolling_std_matches_pandas(returns, use_loops, window, min_periods, ddof):
+    expected = pd.DataFrame(returns).rolling(window, min_periods=min_periods).std(ddof=ddof).to_numpy()
+    result = kernels.rolling_std(returns, window, min_periods, ddof=ddof)
+    np.testing.assert_allclose(result, expected, rtol=1e-7, atol=1e-12)
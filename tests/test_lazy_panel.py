@@ -0,0 +1,56 @@
+"""
+Tests of `lazy_panel` projections over a cached `FetchSource`.
+"""
+
+import pandas as pd
+
+import price_cache
+from lazy_panel import FetchSource, LazyPricePanel
+from providers import FakeProvider
+
+TICKERS = ["A", "B", "C"]
+START, END = "2020-01-01", "2022-01-01"
+
+
+def test_select_tail_reads_only_selected_ticker(tmp_path, monkeypatch):
+    provider = FakeProvider()
+    source = FetchSource(TICKERS, START, END, cache_dir=str(tmp_path), provider=provider)
+    panel = LazyPricePanel(source, TICKERS, START, END)
+
+    read = []
+    original = price_cache._read_segment
+
+    def recording_read(path, start=None, end=None):
+        read.append(path)
+        return original(path, start, end)
+
+    monkeypatch.setattr(price_cache, "_read_segment", recording_read)
+    tail = panel.select(["A"]).tail(5).collect()
+
+    expected = provider.get_prices(TICKERS, START, END)[["A"]].iloc[-5:]
+    pd.testing.assert_frame_equal(tail, expected, check_freq=False)
+    # coverage for the whole range was filled, but only A's data was read
+    assert set(source._cache.tickers) == set(TICKERS)
+    assert read and all("/A/" in path for path in read)
+    assert source._panel is None
+
+
+def test_reads_are_projected_from_one_download(tmp_path):
+    calls = []
+
+    class CountingProvider(FakeProvider):
+        def get_prices(self, tickers, start, end):
+            calls.append((tuple(tickers), start, end))
+            return super().get_prices(tickers, start, end)
+
+    provider = CountingProvider()
+    panel = LazyPricePanel(
+        FetchSource(TICKERS, START, END, cache_dir=str(tmp_path), provider=provider), TICKERS, START, END
+    )
+    window = panel.select(["B", "C"]).between("2021-01-01").collect()
+    last = panel.tail(3).collect()
+
+    assert calls == [(tuple(TICKERS), START, END)]
+    full = FakeProvider().get_prices(TICKERS, START, END)
+    pd.testing.assert_frame_equal(window, full.loc["2021-01-01":, ["B", "C"]], check_freq=False)
+    pd.testing.assert_frame_equal(last, full.iloc[-3:], check_freq=False)
@@ -0,0 +1,61 @@
+"""
+Tests of `normalization.normalize_cross_section` against pandas.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.special import ndtri
+
+from normalization import normalize_cross_section
+
+
+def pandas_percentile(values: np.ndarray) -> np.ndarray:
+    return np.stack(
+        [pd.DataFrame(values[..., k]).rank(axis=1, pct=True).to_numpy() for k in range(values.shape[-1])],
+        axis=-1
+    )
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(40, 30, 3))
+    x[rng.random(x.shape) < 0.1] = np.nan
+    x[:, 5, :] = x[:, 6, :]                     # ties across two tickers
+    x[3] = np.nan                               # all-NaN date
+    x[4, :, 0] = 1.0                            # every value tied
+    x[5, :10, 1] = np.nextafter(1.0, 2.0)       # near-equal but distinct values
+    x[5, 10:20, 1] = 1.0
+    x[5, 20:25, 1] = np.nextafter(1.0, 0.0)
+    x[6, :5, 2] = -0.0                          # signed zeros tie
+    x[6, 5:9, 2] = 0.0
+    x[7, :, 1] = np.round(x[7, :, 1], 1)        # many small tie groups
+    return x
+
+
+def test_percentile_matches_pandas_rank(values):
+    result = normalize_cross_section(values.copy(), "percentile")
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(values))
+    np.testing.assert_allclose(result, pandas_percentile(values), rtol=1e-12)
+
+
+def test_near_equal_values_are_not_ties(values):
+    result = normalize_cross_section(values.copy(), "percentile")
+    assert len(np.unique(result[5, :25, 1])) == 3
+
+
+def test_rank_gauss_maps_average_ranks_through_inverse_normal(values):
+    result = normalize_cross_section(values.copy(), "rank_gauss")
+    pct = pandas_percentile(values)
+    n = np.sum(~np.isnan(values), axis=1, keepdims=True)
+    expected = ndtri((pct * n - 0.5) / n)
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_zscore_matches_pandas(values):
+    result = normalize_cross_section(values.copy(), "zscore")
+    for k in range(values.shape[-1]):
+        df = pd.DataFrame(values[..., k])
+        expected = df.sub(df.mean(axis=1), axis=0).div(df.std(axis=1), axis=0)
+        np.testing.assert_allclose(result[..., k], expected.to_numpy(), rtol=1e-10, atol=1e-12)
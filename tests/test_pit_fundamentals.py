@@ -0,0 +1,70 @@
+"""
+Tests of `pit_fundamentals.PointInTimeStore` as-of lookups.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pit_fundamentals import PointInTimeStore
+
+
+def snapshot(values: dict) -> pd.DataFrame:
+    return pd.DataFrame({"trailingPE": values}).rename_axis("ticker")
+
+
+def make_store() -> PointInTimeStore:
+    store = PointInTimeStore()
+    store.record(snapshot({"A": 10.0, "B": 20.0}), "2021-01-04")
+    store.record(snapshot({"A": 11.0, "B": np.nan, "C": 30.0}), "2021-02-01")
+    return store
+
+
+def test_record_is_visible_from_its_timestamp_on():
+    store = make_store()
+    dates = ["2021-01-03", "2021-01-04", "2021-01-31", "2021-02-01", "2021-03-01"]
+    result = store.as_of(dates, "trailingPE", ["A"])
+    np.testing.assert_array_equal(result["A"].to_numpy(), [np.nan, 10.0, 10.0, 11.0, 11.0])
+
+
+def test_timestamps_within_a_day_are_respected():
+    store = PointInTimeStore()
+    store.record(snapshot({"A": 1.0}), "2021-01-04 16:00")
+    result = store.as_of(["2021-01-04", "2021-01-04 16:00", "2021-01-05"], "trailingPE", ["A"])
+    np.testing.assert_array_equal(result["A"].to_numpy(), [np.nan, 1.0, 1.0])
+
+
+def test_ticker_without_a_snapshot_yet_is_missing():
+    store = make_store()
+    result = store.as_of(["2021-01-15", "2021-02-15"], "trailingPE", ["C", "D"])
+    np.testing.assert_array_equal(result["C"].to_numpy(), [np.nan, 30.0])
+    assert result["D"].isna().all()
+
+
+def test_missing_values_fall_back_to_the_last_known_one():
+    store = make_store()
+    result = store.as_of(["2021-02-15"], "trailingPE", ["B"])
+    assert result.loc["2021-02-15", "B"] == 20.0
+
+
+def test_snapshot_matches_as_of_and_survives_save(tmp_path):
+    path = str(tmp_path / "pit.parquet")
+    store = make_store()
+    store.path = path
+    store.save()
+
+    reloaded = PointInTimeStore(path)
+    expected = store.snapshot("2021-02-15", ["A", "B", "C"])
+    pd.testing.assert_frame_equal(reloaded.snapshot("2021-02-15", ["A", "B", "C"]), expected)
+    assert list(expected["trailingPE"]) == [11.0, 20.0, 30.0]
+
+
+def test_only_changed_tickers_are_recorded_again():
+    store = make_store()
+    rows = len(store.records)
+    store.record(snapshot({"A": 11.0, "B": np.nan, "C": 30.0}), "2021-03-01", only_changed=True)
+    assert len(store.records) == rows
+
+    store.record(snapshot({"A": 11.0, "B": 21.0, "C": 30.0, "D": 5.0}), "2021-04-01", only_changed=True)
+    assert list(store.records["ticker"].iloc[rows:]) == ["B", "D"]
+    result = store.as_of(["2021-04-01"], "trailingPE", ["A", "B", "C", "D"])
+    assert list(result.iloc[0]) == [11.0, 21.0, 30.0, 5.0]
@@ -0,0 +1,57 @@
+"""
+Offline tests of `price_cache.PriceCache` backed by the fake provider.
+"""
+
+import pandas as pd
+
+from price_cache import PriceCache
+from providers import FakeProvider
+
+
+class RecordingDownload:
+    """
+    FakeProvider download function that records every requested range.
+    """
+
+    def __init__(self):
+        self.provider = FakeProvider()
+        self.calls = []
+
+    def __call__(self, tickers, start, end):
+        self.calls.append((tuple(tickers), start, end))
+        return self.provider.get_prices(tickers, start, end)
+
+
+def test_refresh_fetches_missing_head_and_tail(tmp_path):
+    download = RecordingDownload()
+    cache = PriceCache(str(tmp_path), download)
+    tickers = ["AAA", "BBB"]
+
+    cold = cache.refresh(tickers, "2020-01-01", "2021-01-01")
+    assert download.calls == [(("AAA", "BBB"), "2020-01-01", "2021-01-01")]
+    assert cache.coverage("AAA") == (pd.Timestamp("2020-01-01"), pd.Timestamp("2021-01-01"))
+
+    download.calls.clear()
+    wide = cache.refresh(tickers, "2019-01-01", "2022-01-01")
+    assert sorted(download.calls) == [
+        (("AAA", "BBB"), "2019-01-01", "2020-01-01"),
+        (("AAA", "BBB"), "2021-01-01", "2022-01-01"),
+    ]
+    assert cache.coverage("AAA") == (pd.Timestamp("2019-01-01"), pd.Timestamp("2022-01-01"))
+
+    expected = FakeProvider().get_prices(tickers, "2019-01-01", "2022-01-01")
+    pd.testing.assert_frame_equal(wide, expected, check_freq=False)
+    assert len(cold) == len(expected.loc[:"2020-12-31"].loc["2020-01-01":])
+
+
+def test_refresh_does_not_refetch_covered_empty_tail(tmp_path):
+    download = RecordingDownload()
+    cache = PriceCache(str(tmp_path), download)
+
+    cache.refresh(["AAA"], "2020-01-01", "2021-01-01")
+    # a later range with no bars (e.g. a delisted name) is still covered
+    cache._store(["AAA"], pd.DataFrame({"AAA": []}, dtype="float64"), "2021-01-01", "2021-06-01")
+
+    download.calls.clear()
+    cache.refresh(["AAA"], "2020-01-01", "2021-06-01")
+    assert download.calls == []
@@ -0,0 +1,102 @@
+"""
+Tests of the `replay` record/replay harness: round trips, misses and
+simulated failures.
+"""
+
+import pandas as pd
+import pytest
+
+import throttle
+from data_fetcher import fetch_fundamentals, fetch_price_data
+from fundamentals_cache import FundamentalsCache
+from price_cache import COVERAGE_FILE
+from providers import FakeProvider
+from replay import RecordingProvider, ReplayProvider, SimulatedProviderError
+
+TICKERS = ["A", "B"]
+START, END = "2020-01-01", "2021-01-01"
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    recorder = RecordingProvider(FakeProvider(), str(tmp_path))
+    # two overlapping requests are merged per ticker
+    recorder.get_prices(TICKERS, START, "2020-09-01")
+    recorder.get_prices(TICKERS, "2020-06-01", END)
+    for ticker in TICKERS:
+        recorder.get_fundamentals(ticker)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(throttle.time, "sleep", lambda seconds: None)
+
+
+def test_replay_returns_recorded_prices(fixture_dir):
+    replay = ReplayProvider(fixture_dir)
+    df = replay.get_prices(TICKERS, "2020-03-01", "2020-12-01")
+    expected = FakeProvider().get_prices(TICKERS, "2020-03-01", "2020-12-01")
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+    assert replay.get_fundamentals("A") == FakeProvider().get_fundamentals("A")
+    assert replay.requests == 2 and replay.failures == 0
+
+
+def test_unrecorded_ticker_is_missing(fixture_dir):
+    df = ReplayProvider(fixture_dir).get_prices(["A", "Z"], START, END)
+    assert list(df.columns) == ["A", "Z"]
+    assert df["A"].notna().all() and df["Z"].isna().all()
+
+
+def test_unrecorded_range_is_empty(fixture_dir):
+    df = ReplayProvider(fixture_dir).get_prices(TICKERS, "2015-01-01", "2016-01-01")
+    assert df.empty and list(df.columns) == TICKERS
+
+
+def test_unrecorded_fundamentals_are_empty(fixture_dir):
+    assert ReplayProvider(fixture_dir).get_fundamentals("Z") == {}
+
+
+def test_failures_are_raised_and_counted(fixture_dir):
+    replay = ReplayProvider(fixture_dir, failure_rate=1.0)
+    with pytest.raises(SimulatedProviderError):
+        replay.get_prices(TICKERS, START, END)
+    with pytest.raises(SimulatedProviderError):
+        replay.get_fundamentals("A")
+    assert replay.requests == 2 and replay.failures == 2
+
+
+def test_failure_draws_are_reproducible(fixture_dir):
+    def failures(seed):
+        replay = ReplayProvider(fixture_dir, failure_rate=0.5, seed=seed)
+        outcomes = []
+        for _ in range(20):
+            try:
+                replay.get_fundamentals("A")
+                outcomes.append(False)
+            except SimulatedProviderError:
+                outcomes.append(True)
+        return outcomes
+
+    assert failures(1) == failures(1)
+    assert 0 < sum(failures(1)) < 20
+
+
+def test_price_fetch_retries_then_raises(fixture_dir, tmp_path, no_backoff):
+    replay = ReplayProvider(fixture_dir, failure_rate=1.0)
+    with pytest.raises(SimulatedProviderError):
+        fetch_price_data(TICKERS, START, END, cache_dir=str(tmp_path / "cache"), provider=replay)
+    assert replay.requests == 3  # first attempt and two retries
+    assert not (tmp_path / "cache" / COVERAGE_FILE).exists()
+
+
+def test_failed_fundamentals_are_missing_and_not_cached(fixture_dir, no_backoff):
+    cache = FundamentalsCache()
+    replay = ReplayProvider(fixture_dir, failure_rate=1.0)
+    df = fetch_fundamentals(TICKERS, cache=cache, provider=replay, max_retries=1)
+    assert df.isna().all().all() and list(df.index) == TICKERS
+    assert cache.stats()["entries"] == 0
+
+    df = fetch_fundamentals(TICKERS, cache=cache, provider=ReplayProvider(fixture_dir))
+    assert df.loc["A", "marketCap"] == FakeProvider().get_fundamentals("A")["marketCap"]
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,29 @@
+"""
+Tests of `universe.UniverseStore` bit-packed membership lookups.
+"""
+
+import numpy as np
+import pandas as pd
+
+from universe import UniverseStore
+
+
+def test_is_member_matches_mask():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2021-01-01", periods=20)
+    tickers = [f"T{j}" for j in range(11)]  # not a multiple of 8
+    mask = pd.DataFrame(rng.random((20, 11)) < 0.5, index=dates, columns=tickers)
+    store = UniverseStore.from_mask(mask)
+
+    for date in dates:
+        for ticker in tickers:
+            assert store.is_member(date, ticker) == mask.loc[date, ticker]
+    pd.testing.assert_frame_equal(store.mask(), mask, check_freq=False)
+
+
+def test_unknown_ticker_and_early_date_are_not_members():
+    dates = pd.bdate_range("2021-01-01", periods=3)
+    store = UniverseStore.from_mask(pd.DataFrame(True, index=dates, columns=["A"]))
+    assert store.is_member(dates[1], "A")
+    assert not store.is_member(dates[1], "B")
+    assert not store.is_member(dates[0] - pd.Timedelta(days=1), "A")
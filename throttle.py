@@ -0,0 +1,84 @@
+"""
+This module provides small concurrency helpers for talking to data
+providers:
+- A thread-safe token-bucket rate limiter
+- Retry with exponential backoff and jitter
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens are replenished continuously at `rate` per second up to
+    `capacity`. Each call to `acquire` consumes one token, blocking until
+    one is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum burst size, defaults to `rate` (at least 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until a token is available and consumes it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            # sleep outside the lock so other threads can refill/check
+            time.sleep(wait)
+
+
+def retry_with_backoff(
+    fn: Callable[[], T],
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+) -> T:
+    """
+    Calls `fn`, retrying failures with exponential backoff and jitter.
+
+    Args:
+        fn (Callable): Zero-argument function to call.
+        max_retries (int): Number of retries after the first attempt.
+        base_delay (float): Delay in seconds before the first retry.
+        max_delay (float): Upper bound on a single delay.
+        retry_on (Tuple[Type[BaseException], ...]): Exception types that trigger a retry.
+
+    Returns:
+        The return value of `fn`. The last exception is re-raised once
+        retries are exhausted.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except retry_on:
+            if attempt == max_retries:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.0))
@@ -0,0 +1,155 @@
+"""
+This module stores time-varying universe membership (e.g. index
+constituents) so factor ranking and backtests only use tickers that were
+actually eligible on each date, avoiding survivorship bias.
+
+Membership is a dates x tickers boolean matrix stored as packed bitsets
+(one bit per ticker per date, 8x smaller than a boolean array). Row
+lookups are a binary search plus one row unpack; whole masks and
+per-ticker histories are unpacked with vectorized bit operations.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class UniverseStore:
+    """
+    Packed bitset of universe membership per date.
+
+    Queries use as-of semantics: membership on a date is taken from the
+    latest stored date at or before it.
+    """
+
+    def __init__(self, dates: Sequence, tickers: List[str], bits: np.ndarray):
+        """
+        Args:
+            dates (Sequence): Sorted membership dates (one row per date).
+            tickers (List[str]): Ticker of each bit column.
+            bits (np.ndarray): uint8 array of shape (dates, ceil(tickers / 8)),
+                as produced by `np.packbits(mask, axis=1)`.
+        """
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        self.bits = np.asarray(bits, dtype=np.uint8)
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_mask(cls, mask: pd.DataFrame) -> "UniverseStore":
+        """
+        Builds a store from a boolean dates x tickers DataFrame.
+        """
+        mask = mask.sort_index()
+        bits = np.packbits(mask.to_numpy(dtype=bool), axis=1)
+        return cls(mask.index, list(mask.columns), bits)
+
+    @classmethod
+    def from_intervals(cls, intervals: pd.DataFrame, dates: Sequence) -> "UniverseStore":
+        """
+        Builds a store from membership intervals.
+
+        Args:
+            intervals (pd.DataFrame): Columns 'ticker', 'start' and 'end'
+                (end exclusive; missing end means still a member).
+            dates (Sequence): Dates on which membership is recorded,
+                e.g. trading days.
+
+        Returns:
+            UniverseStore: The membership store.
+        """
+        dates = pd.DatetimeIndex(dates).sort_values()
+        tickers = sorted(intervals["ticker"].unique())
+        cols = pd.Index(tickers).get_indexer(intervals["ticker"])
+
+        start_rows = dates.searchsorted(pd.DatetimeIndex(intervals["start"]), side="left")
+        ends = pd.DatetimeIndex(pd.to_datetime(intervals["end"]))
+        end_rows = np.where(ends.isna(), len(dates), dates.searchsorted(ends, side="left"))
+
+        # difference array: +1 where an interval opens, -1 where it closes
+        counts = np.zeros((len(dates) + 1, len(tickers)), dtype=np.int32)
+        np.add.at(counts, (start_rows, cols), 1)
+        np.add.at(counts, (end_rows, cols), -1)
+        mask = np.cumsum(counts[:-1], axis=0) > 0
+
+        return cls(dates, tickers, np.packbits(mask, axis=1))
+
+    @classmethod
+    def load(cls, path: str) -> "UniverseStore":
+        """
+        Loads a store written by `save`.
+        """
+        data = np.load(path, allow_pickle=False)
+        return cls(data["dates"].astype("datetime64[ns]"), data["tickers"].tolist(), data["bits"])
+
+    def save(self, path: str) -> None:
+        """
+        Writes the store to a compressed `.npz` file.
+        """
+        np.savez_compressed(
+            path,
+            dates=self.dates.as_unit("ns").asi8,
+            tickers=np.array(self.tickers, dtype=str),
+            bits=self.bits
+        )
+
+    def members_on(self, date) -> List[str]:
+        """
+        Returns the tickers eligible on `date`.
+        """
+        row = self._row(date)
+        if row < 0:
+            return []
+        flags = np.unpackbits(self.bits[row], count=len(self.tickers)).astype(bool)
+        return [ticker for ticker, member in zip(self.tickers, flags) if member]
+
+    def is_member(self, date, ticker: str) -> bool:
+        """
+        Returns whether `ticker` is eligible on `date`.
+        """
+        row = self._row(date)
+        col = self._positions.get(ticker)
+        if row < 0 or col is None:
+            return False
+        # one byte: ticker col is bit (7 - col % 8) of byte col // 8
+        return bool((self.bits[row, col >> 3] >> (7 - (col & 7))) & 1)
+
+    def dates_for(self, ticker: str) -> pd.DatetimeIndex:
+        """
+        Returns the stored dates on which `ticker` is eligible.
+        """
+        col = self._positions.get(ticker)
+        if col is None:
+            return pd.DatetimeIndex([])
+        return self.dates[self._column_bits(col).astype(bool)]
+
+    def mask(self, dates: Optional[Sequence] = None, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns a boolean dates x tickers membership frame.
+
+        Args:
+            dates (Sequence): Dates to align to (as-of), defaults to stored dates.
+            tickers (List[str]): Columns to return; unknown tickers are never members.
+
+        Returns:
+            pd.DataFrame: Membership flags.
+        """
+        dates = self.dates if dates is None else pd.DatetimeIndex(dates)
+        tickers = self.tickers if tickers is None else list(tickers)
+
+        rows = self.dates.searchsorted(dates, side="right") - 1
+        full = np.unpackbits(self.bits[np.maximum(rows, 0)], axis=1, count=len(self.tickers)).astype(bool)
+        full[rows < 0] = False
+
+        cols = np.array([self._positions.get(ticker, -1) for ticker in tickers], dtype=np.intp)
+        values = full[:, np.maximum(cols, 0)] if len(self.tickers) else np.zeros((len(dates), len(cols)), bool)
+        values[:, cols < 0] = False
+        return pd.DataFrame(values, index=dates, columns=tickers)
+
+    def _row(self, date) -> int:
+        return int(self.dates.searchsorted(pd.Timestamp(date), side="right")) - 1
+
+    def _column_bits(self, col: int) -> np.ndarray:
+        # np.packbits is big-endian: ticker j is bit (7 - j % 8) of byte j // 8
+        return (self.bits[:, col >> 3] >> (7 - (col & 7))) & 1